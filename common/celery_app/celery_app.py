@@ -30,6 +30,59 @@ if redis_password:
 else:
     redis_url = f"redis://{redis_host}:{redis_port}/{redis_db}"
 
+# Сериализатор сообщений: orjson (C-реализация) при наличии, иначе стандартный json.
+# json остается в accept_content, чтобы читать сообщения, поставленные до переключения.
+# Decimal, UUID, datetime, date, time и bytes передаются маркерами __type__/__value__
+# json-сериализатора kombu, поэтому аргументы и результаты задач сохраняют свои типы
+try:
+    import orjson
+    from uuid import UUID
+    from kombu.serialization import register as register_serializer
+    from kombu.utils.json import JSONEncoder as KombuJSONEncoder, object_hook as kombu_object_hook
+    
+    _kombu_default = KombuJSONEncoder().default
+    
+    def _mark_uuids(obj):
+        """UUID в маркер kombu: orjson сериализует UUID сам, не вызывая default"""
+        if isinstance(obj, UUID):
+            return _kombu_default(obj)
+        if isinstance(obj, dict):
+            return {key: _mark_uuids(value) for key, value in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [_mark_uuids(value) for value in obj]
+        return obj
+    
+    def _restore_types(obj):
+        """Обратное преобразование маркеров kombu (orjson.loads не поддерживает object_hook)"""
+        if isinstance(obj, dict):
+            return kombu_object_hook({key: _restore_types(value) for key, value in obj.items()})
+        if isinstance(obj, list):
+            return [_restore_types(value) for value in obj]
+        return obj
+    
+    def _orjson_dumps(obj):
+        return orjson.dumps(
+            _mark_uuids(obj),
+            default=_kombu_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    
+    def _orjson_loads(data):
+        if not isinstance(data, str):
+            data = bytes(data)
+        obj = orjson.loads(data)
+        # Обход структуры нужен только сообщениям, в которых есть маркеры типов
+        marker = '"__type__"' if isinstance(data, str) else b'"__type__"'
+        return _restore_types(obj) if marker in data else obj
+    
+    register_serializer(
+        'orjson', _orjson_dumps, _orjson_loads,
+        content_type='application/x-orjson', content_encoding='binary'
+    )
+    TASK_SERIALIZER = 'orjson'
+except ImportError:
+    TASK_SERIALIZER = 'json'
+
 # Create Celery instance
 celery_app = Celery('hr_system')
 
@@ -37,9 +90,10 @@ celery_app = Celery('hr_system')
 celery_app.conf.update(
     broker_url=redis_url,
     result_backend=redis_url,
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    task_serializer=TASK_SERIALIZER,
+    accept_content=[TASK_SERIALIZER, 'json'],
+    result_serializer=TASK_SERIALIZER,
+    result_accept_content=[TASK_SERIALIZER, 'json'],
     timezone='Europe/Moscow',
     enable_utc=True,
     broker_connection_retry_on_startup=True,
@@ -64,15 +118,6 @@ celery_app.conf.update(
     
     # Task routing - техническая архитектура очередей
     task_routes=get_task_routes(),
-    
-    # Include task modules (используем абсолютные пути)
-    include=[
-        'common.tasks.fillout_tasks',
-        'common.tasks.parsing_tasks', 
-        'common.tasks.embedding_tasks',
-        'common.tasks.reranking_tasks',
-        'common.tasks.workflows'
-    ]
 )
 
 # Export the app for compatibility
@@ -82,26 +127,55 @@ def get_celery_app():
     """Get the configured Celery application instance"""
     return celery_app
 
-# Import tasks to register them (after app is defined to avoid circular imports)
-try:
-    # Используем абсолютные импорты для избежания ошибок
-    import sys
-    import os
+# Корень проекта (для абсолютных импортов common.*) добавляется в PYTHONPATH
+# скриптами запуска воркеров, а не через sys.path при каждом импорте модуля
+
+# Модули задач импортируются лениво при старте воркера (или при финализации app),
+# а не при каждом импорте celery_app: клиентам, которые только отправляют задачи,
+# не нужно тянуть SQLAlchemy-модели, эмбеддинги и реранкер
+from importlib.util import find_spec
+from common.tasks import TASK_MODULES
+
+_available_task_modules = []
+for module_name in TASK_MODULES:
+    if find_spec(module_name) is None:
+        logger.warning(f"⚠️ Task module not found, skipping: {module_name}")
+    else:
+        _available_task_modules.append(module_name)
+
+celery_app.autodiscover_tasks(_available_task_modules, related_name=None)
+
+
+from celery.signals import worker_init, worker_process_init
+
+
+@worker_init.connect
+def preload_task_modules(sender=None, **kwargs):
+    """
+    Загрузка модулей задач в родительском процессе воркера до форка
     
-    # Добавляем путь к корню проекта в sys.path если его нет
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
+    Модули задач (и через них SQLAlchemy-модели и CRUD) импортируются один раз
+    в родителе, после чего gc.freeze() переносит все созданные объекты в
+    постоянное поколение: сборщик мусора в дочерних процессах их не обходит
+    и не пишет в их заголовки, поэтому страницы памяти остаются общими (copy-on-write).
+    """
+    import gc
     
-    # Импортируем модули задач с абсолютными путями
-    from common.tasks import fillout_tasks, parsing_tasks, embedding_tasks, reranking_tasks, workflows
-    logger.info("✅ All task modules imported successfully")
-except Exception as e:
-    logger.error(f"❌ Error importing task modules: {e}")
-    logger.error(f"Current sys.path: {sys.path[:3]}...")  # Показываем первые 3 пути для отладки
-
-# Export the app instance for Celery CLI
-# app is already imported above
+    celery_app.loader.import_default_modules()
+    gc.collect()
+    gc.freeze()
+    logger.info("🧊 Task modules preloaded and frozen before forking worker processes")
+
+
+@worker_process_init.connect
+def reset_inherited_db_pool(**kwargs):
+    """Соединения пула БД, унаследованные от родителя, не используются в дочернем процессе"""
+    try:
+        from common.database.config import database
+    except Exception:
+        return
+    if database.engine is not None:
+        database.engine.dispose(close=False)
 
 
 def run_test_tasks():
@@ -84,8 +84,10 @@ def get_task_routes() -> Dict[str, Dict[str, str]]:
         'common.tasks.embedding_tasks.generate_all_embeddings': {'queue': EMBEDDINGS_QUEUE},
         
         # 🎯 Reranking задачи (reranking)
-        'common.tasks.reranking_tasks.rerank_jobs_for_resume': {'queue': RERANKING_QUEUE},
-        'common.tasks.reranking_tasks.rerank_resumes_for_job': {'queue': RERANKING_QUEUE},
+        # Результаты реранкинга пишутся в PostgreSQL и воспроизводимы повторным запуском,
+        # поэтому сообщения не требуют персистентной доставки
+        'common.tasks.reranking_tasks.rerank_jobs_for_resume': {'queue': RERANKING_QUEUE, 'delivery_mode': 'transient'},
+        'common.tasks.reranking_tasks.rerank_resumes_for_job': {'queue': RERANKING_QUEUE, 'delivery_mode': 'transient'},
     }
     
     return routes
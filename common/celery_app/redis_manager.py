@@ -14,6 +14,19 @@ import redis
 
 logger = logging.getLogger(__name__)
 
+# Шаблон пароля в Redis URL компилируется один раз при импорте
+_URL_PASSWORD_RE = re.compile(r'(:)([^@]+)(@)')
+
+# Прикладные кэши (сводки анализа, предобработка, эмбеддинги) живут в отдельной БД Redis,
+# чтобы долгоживущие ключи не копились в БД брокера и результатов Celery
+REDIS_CACHE_DB = int(os.getenv('REDIS_CACHE_DB', '1'))
+
+# После ошибки соединения кэш не используется столько секунд (запросы не ждут таймаутов)
+CACHE_RETRY_INTERVAL = float(os.getenv('REDIS_CACHE_RETRY_INTERVAL', '30'))
+
+_cache_client = None
+_cache_retry_at = 0.0
+
 
 class RedisManager:
     """Unified Redis management for Celery system"""
@@ -265,7 +278,7 @@ class RedisManager:
     def mask_redis_url(self, url: str) -> str:
         """Mask password in Redis URL for safe logging"""
         if ":" in url and "@" in url:
-            return re.sub(r'(:)([^@]+)(@)', r'\1***\3', url)
+            return _URL_PASSWORD_RE.sub(r'\1***\3', url)
         return url
     
     @lru_cache(maxsize=1)
@@ -292,6 +305,48 @@ class RedisManager:
         return f"Redis {self.host}:{self.port}/{self.db} ({auth_status})"
 
 
+def get_cache_client() -> Optional[redis.Redis]:
+    """
+    Общий клиент Redis для прикладных кэшей (БД REDIS_CACHE_DB)
+    
+    Соединение проверяется PING при создании клиента. Если Redis недоступен,
+    возвращается None, и новая попытка делается не раньше чем через
+    CACHE_RETRY_INTERVAL секунд, так что вызывающий код сразу работает без кэша.
+    """
+    global _cache_client, _cache_retry_at
+    if _cache_client is not None:
+        return _cache_client
+    if time.monotonic() < _cache_retry_at:
+        return None
+    try:
+        client = redis.Redis(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', '6379')),
+            db=REDIS_CACHE_DB,
+            password=os.getenv('REDIS_PASSWORD') or None,
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+        client.ping()
+    except Exception as e:
+        _cache_retry_at = time.monotonic() + CACHE_RETRY_INTERVAL
+        logger.warning(f"⚠️ Кэш Redis недоступен, повторная попытка через {CACHE_RETRY_INTERVAL:.0f} с: {e}")
+        return None
+    _cache_client = client
+    return client
+
+
+def report_cache_error(error: Exception) -> None:
+    """
+    Учет ошибки операции с кэшем: при потере соединения клиент сбрасывается,
+    и get_cache_client возвращает None до истечения CACHE_RETRY_INTERVAL
+    """
+    global _cache_client, _cache_retry_at
+    if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+        _cache_client = None
+        _cache_retry_at = time.monotonic() + CACHE_RETRY_INTERVAL
+
+
 # Global instance for easy access
 redis_manager = RedisManager()
 
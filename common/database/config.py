@@ -24,6 +24,22 @@ from ..models.analysis_results import RerankerAnalysisResult, RerankerAnalysisSe
 # Загружаем переменные окружения
 load_dotenv()
 
+# Сериализация JSON/JSONB колонок (additional_metadata и т.п.): orjson при наличии,
+# иначе стандартный json движка SQLAlchemy
+try:
+    import orjson
+    
+    def _json_serializer(obj) -> str:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+    
+    JSON_ENGINE_ARGS = {'json_serializer': _json_serializer, 'json_deserializer': orjson.loads}
+except ImportError:
+    JSON_ENGINE_ARGS = {}
+
 
 class DatabaseConfig:
     """Конфигурация базы данных"""
@@ -57,6 +73,9 @@ class DatabaseConfig:
         self.POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
         self.POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '3600'))
         self.ECHO = os.getenv('DB_ECHO', 'False').lower() == 'true'
+        
+        # Пакетные executemany: строк в одном многострочном INSERT ... VALUES
+        self.INSERT_PAGE_SIZE = int(os.getenv('DB_INSERT_PAGE_SIZE', '1000'))
     
     def _get_ssl_config(self) -> dict:
         """Получение SSL конфигурации в зависимости от окружения"""
@@ -110,6 +129,11 @@ class Database:
                 pool_timeout=self.config.POOL_TIMEOUT,
                 pool_recycle=self.config.POOL_RECYCLE,
                 echo=self.config.ECHO,
+                # INSERT executemany уходит многострочным VALUES (как execute_values),
+                # UPDATE/DELETE executemany - через psycopg2 execute_batch
+                executemany_mode='values_plus_batch',
+                insertmanyvalues_page_size=self.config.INSERT_PAGE_SIZE,
+                **JSON_ENGINE_ARGS,
                 connect_args=connect_args  # ИСПРАВЛЕНИЕ: добавляем SSL конфигурацию
             )
             
@@ -0,0 +1,71 @@
+"""
+Миграция для добавления составных индексов по внешним ключам и статусам
+
+Индексы покрывают типичные фильтры списков: вакансии компании по активности,
+кандидаты вакансии по статусу, действия кандидата по завершенности и т.д.
+"""
+
+from sqlalchemy import text
+from database.config import database
+
+
+FILTER_INDEXES = {
+    'idx_jobs_company_active': 'jobs(company_id, is_active)',
+    'idx_job_candidates_job_status': 'job_candidates(job_id, status)',
+    'idx_job_candidates_current_stage': 'job_candidates(current_stage_id)',
+    'idx_candidate_actions_candidate_completed': 'candidate_actions(candidate_id, completed)',
+    'idx_candidate_actions_assignee': 'candidate_actions(assigned_to)',
+    'idx_company_contacts_company_primary': 'company_contacts(company_id, is_primary)',
+    'idx_hiring_stages_company_position': 'hiring_stages(company_id, position)',
+}
+
+
+def create_filter_indexes():
+    """Создание составных индексов для фильтруемых колонок"""
+
+    db = database.get_session()
+
+    try:
+        print("📊 Создание индексов для фильтруемых колонок...")
+
+        for index_name, target in FILTER_INDEXES.items():
+            db.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {target}"))
+
+        db.commit()
+        print(f"✅ Создано индексов: {len(FILTER_INDEXES)}")
+
+    except Exception as e:
+        print(f"❌ Ошибка при создании индексов: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def drop_filter_indexes():
+    """Удаление составных индексов для фильтруемых колонок"""
+
+    db = database.get_session()
+
+    try:
+        print("🗑️ Удаление индексов для фильтруемых колонок...")
+
+        for index_name in FILTER_INDEXES:
+            db.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+        db.commit()
+        print("✅ Индексы удалены успешно")
+
+    except Exception as e:
+        print(f"❌ Ошибка при удалении индексов: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'rollback':
+        drop_filter_indexes()
+    else:
+        create_filter_indexes()
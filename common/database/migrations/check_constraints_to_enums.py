@@ -0,0 +1,57 @@
+"""
+Замена CheckConstraint с IN-списками на нативные PostgreSQL ENUM типы
+
+Revision ID: check_constraints_to_enums
+Revises: embedding_metadata_jsonb
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+from common.models.utils import ModelConstraints
+from common.models.companies.hiring_stage import CandidateAction, CustomValue
+
+revision = 'check_constraints_to_enums'
+down_revision = 'embedding_metadata_jsonb'
+branch_labels = None
+depends_on = None
+
+
+# (таблица, колонка, имя ENUM типа, значения, CheckConstraint, исходный тип)
+ENUM_COLUMNS = [
+    ('jobs', 'employment_type', 'employment_type_enum',
+     ModelConstraints.EMPLOYMENT_TYPES, 'ck_job_employment_type', 'VARCHAR(50)'),
+    ('jobs', 'experience_level', 'experience_level_enum',
+     ModelConstraints.EXPERIENCE_LEVELS, 'ck_job_experience_level', 'VARCHAR(50)'),
+    ('job_candidates', 'status', 'application_status_enum',
+     ModelConstraints.APPLICATION_STATUSES, 'ck_candidate_status', 'VARCHAR(50)'),
+    ('candidate_actions', 'action_type', 'action_type_enum',
+     CandidateAction.ACTION_TYPES, 'ck_action_type', 'VARCHAR(50)'),
+    ('custom_values', 'type', 'custom_value_type_enum',
+     CustomValue.VALUE_TYPES, 'ck_custom_value_type', 'VARCHAR(20)'),
+]
+
+
+def upgrade():
+    """Создание ENUM типов и перевод колонок на них"""
+    for table, column, enum_name, values, check_name, _ in ENUM_COLUMNS:
+        values_sql = ', '.join(f"'{value}'" for value in values)
+        op.execute(f"CREATE TYPE {enum_name} AS ENUM ({values_sql})")
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {check_name}")
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN "{column}" '
+            f'TYPE {enum_name} USING "{column}"::{enum_name}'
+        )
+
+
+def downgrade():
+    """Возврат колонок к VARCHAR с CheckConstraint и удаление ENUM типов"""
+    for table, column, enum_name, values, check_name, original_type in reversed(ENUM_COLUMNS):
+        values_sql = ', '.join(f"'{value}'" for value in values)
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN "{column}" '
+            f'TYPE {original_type} USING "{column}"::text'
+        )
+        op.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {check_name} CHECK ("{column}" IN ({values_sql}))'
+        )
+        op.execute(f"DROP TYPE IF EXISTS {enum_name}")
@@ -0,0 +1,50 @@
+"""
+Перевод embedding_metadata.additional_metadata с JSON на JSONB с GIN индексом
+
+Revision ID: embedding_metadata_jsonb
+Revises: add_embedding_metadata
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+revision = 'embedding_metadata_jsonb'
+down_revision = 'add_embedding_metadata'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Смена типа колонки на JSONB и создание индексов"""
+    op.execute(
+        "ALTER TABLE embedding_metadata "
+        "ALTER COLUMN additional_metadata TYPE jsonb USING additional_metadata::jsonb"
+    )
+    
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_embedding_metadata_gin', 'embedding_metadata', ['additional_metadata'],
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'idx_embedding_model_name', 'embedding_metadata', ['model_name'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade():
+    """Удаление индексов и возврат типа колонки к JSON"""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_embedding_model_name', table_name='embedding_metadata',
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            'idx_embedding_metadata_gin', table_name='embedding_metadata',
+            postgresql_concurrently=True, if_exists=True
+        )
+    
+    op.execute(
+        "ALTER TABLE embedding_metadata "
+        "ALTER COLUMN additional_metadata TYPE json USING additional_metadata::json"
+    )
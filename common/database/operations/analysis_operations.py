@@ -4,24 +4,185 @@ CRUD операции для результатов анализа BGE Reranker
 Операции для сохранения, поиска и управления результатами анализа
 """
 
+import io
+import json
+import logging
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, asc, and_, or_, func
-from uuid import UUID
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy.orm import Session, joinedload, selectinload, load_only
+from sqlalchemy import desc, asc, and_, or_, func, select, insert, text
+from uuid import UUID, uuid4
 
 from .base_crud import BaseCRUD
 from common.models.analysis_results import RerankerAnalysisResult, RerankerAnalysisSession
-from common.database.operations.candidate_operations import SubmissionCRUD
+from common.models.candidates import Submission
 from common.database.operations.company_operations import JobCRUD
+from common.celery_app.redis_manager import get_cache_client, report_cache_error
+
+logger = logging.getLogger(__name__)
+
+# Время жизни закэшированной сводки анализа по вакансии (секунды)
+SUMMARY_CACHE_TTL = 300
+
+# Ограничение времени одного пакетного DELETE при очистке старых записей (мс)
+DELETE_STATEMENT_TIMEOUT_MS = 30000
+
+
+def invalidate_job_summary(*job_ids: int) -> None:
+    """
+    Инвалидация закэшированных сводок вакансий
+    
+    Вместо поиска ключей по шаблону увеличивается версия сводки вакансии,
+    которая входит в ключ кэша: старые записи перестают читаться и истекают по TTL.
+    """
+    cache = get_cache_client()
+    if cache is None or not job_ids:
+        return
+    try:
+        with cache.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.incr(f"analysis_summary_ver:{job_id}")
+            pipe.execute()
+    except Exception as e:
+        report_cache_error(e)
+        logger.warning(f"⚠️ Не удалось инвалидировать кэш сводок анализа: {e}")
+
+
+def unique_analysis_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Строки результатов без повторов пары (job_id, submission_id)
+    
+    Все строки одной вставки получают одинаковый processed_at (время начала
+    транзакции), поэтому повтор пары нарушил бы uq_analysis_job_submission_time
+    и откатил бы весь пакет. Для каждой пары остается строка с лучшей (наименьшей)
+    rank_position; порядок строк сохраняется.
+    """
+    best: Dict[Tuple[Any, str], Dict[str, Any]] = {}
+    for row in rows:
+        key = (row['job_id'], str(row['submission_id']))
+        current = best.get(key)
+        if current is None or row['rank_position'] < current['rank_position']:
+            best[key] = row
+    if len(best) == len(rows):
+        return rows
+    logger.warning(f"⚠️ Пропущено повторов пары вакансия-резюме: {len(rows) - len(best)}")
+    kept = {id(row) for row in best.values()}
+    return [row for row in rows if id(row) in kept]
+
+
+def _copy_csv_field(value: Any) -> str:
+    """
+    Поле CSV для COPY: None - пустое поле без кавычек (NULL, как при INSERT),
+    остальные значения в кавычках, чтобы пустая строка не превратилась в NULL
+    """
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _delete_older_than(db: Session, model, pk_column, cutoff_date: datetime, batch_size: int) -> int:
+    """
+    Пакетное удаление записей, созданных раньше cutoff_date
+    
+    Каждый пакет удаляется одним запросом
+    WITH d AS (SELECT pk ... LIMIT n FOR UPDATE SKIP LOCKED) DELETE ... USING d
+    без загрузки ORM-объектов в сессию; строки, заблокированные другими
+    транзакциями, пропускаются и удаляются при следующей очистке. Все пакеты
+    выполняются в одной транзакции с одним commit (один сброс WAL вместо сброса
+    на каждый пакет); каждый отдельный DELETE ограничен statement_timeout.
+    
+    Returns:
+        Количество удаленных записей
+    """
+    table = model.__tablename__
+    pk = pk_column.key
+    delete_batch = text(
+        f"WITH d AS ("
+        f"SELECT {pk} FROM {table} WHERE created_at < :cutoff "
+        f"LIMIT :batch_size FOR UPDATE SKIP LOCKED"
+        f") DELETE FROM {table} t USING d WHERE t.{pk} = d.{pk}"
+    )
+    params = {'cutoff': cutoff_date, 'batch_size': batch_size}
+    
+    total_deleted = 0
+    try:
+        db.execute(text(f"SET LOCAL statement_timeout = {int(DELETE_STATEMENT_TIMEOUT_MS)}"))
+        while True:
+            deleted = db.execute(delete_batch, params).rowcount
+            total_deleted += deleted
+            if deleted < batch_size:
+                break
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return total_deleted
 
 
 class RerankerAnalysisResultCRUD(BaseCRUD):
     """CRUD операции для результатов анализа BGE Reranker"""
     
+    # Начиная с этого количества строк результаты пишутся через COPY вместо INSERT
+    COPY_THRESHOLD = 200
+    
+    # Колонки, заполняемые create_from_enhanced_search, в порядке COPY
+    COPY_COLUMNS = (
+        'job_id', 'submission_id', 'original_similarity', 'rerank_score', 'final_score',
+        'score_improvement', 'rank_position', 'search_params', 'reranker_model',
+        'workflow_stats', 'job_title', 'company_id', 'candidate_name', 'candidate_email',
+        'total_candidates_found', 'analysis_type', 'quality_metrics',
+    )
+    JSON_COLUMNS = frozenset({'search_params', 'workflow_stats', 'quality_metrics'})
+    
+    # Колонки, возвращаемые вместо ORM-объектов при hydrate=False
+    RETURNING_COLUMNS = ('analysis_id', 'submission_id', 'rank_position', 'rerank_score', 'final_score')
+    
     def __init__(self):
         super().__init__(RerankerAnalysisResult)
     
+    def summary_columns(self) -> tuple:
+        """Колонки, которые читает RerankerAnalysisResult.to_summary_dict"""
+        model = self.model
+        return (
+            model.analysis_id, model.job_id, model.job_title, model.company_id,
+            model.submission_id, model.candidate_name, model.original_similarity,
+            model.rerank_score, model.final_score, model.score_improvement,
+            model.rank_position, model.analysis_type, model.reranker_model,
+            model.processed_at,
+        )
+    
+    def bulk_copy_insert(self, db: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Запись строк через COPY ... FROM STDIN в текущей транзакции сессии
+        
+        COPY не разбирает SQL для каждой строки, поэтому на сотнях записей
+        заметно быстрее многострочного INSERT. Commit остается за вызывающим кодом.
+        
+        Returns:
+            Количество записанных строк
+        """
+        # JSON кодируется сериализатором движка, как и при INSERT (orjson, numpy, default=str)
+        json_serializer = db.get_bind().dialect._json_serializer or json.dumps
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write(','.join(
+                _copy_csv_field(
+                    json_serializer(row.get(column)) if column in self.JSON_COLUMNS else row.get(column)
+                )
+                for column in self.COPY_COLUMNS
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        
+        sql = (
+            f"COPY {self.model.__tablename__} ({', '.join(self.COPY_COLUMNS)}) "
+            f"FROM STDIN WITH (FORMAT csv)"
+        )
+        raw_connection = db.connection().connection
+        with raw_connection.cursor() as cursor:
+            cursor.copy_expert(sql, buffer)
+        return len(rows)
+    
     def create_from_enhanced_search(
         self,
         db: Session,
@@ -30,8 +191,10 @@ class RerankerAnalysisResultCRUD(BaseCRUD):
         search_params: Dict[str, Any],
         workflow_stats: Dict[str, Any],
         reranker_model: str,
-        session_uuid: Optional[str] = None
-    ) -> List[RerankerAnalysisResult]:
+        session_uuid: Optional[str] = None,
+        commit: bool = True,
+        hydrate: bool = True
+    ) -> List[Any]:
         """
         Создание записей анализа из результатов enhanced search
         
@@ -43,6 +206,9 @@ class RerankerAnalysisResultCRUD(BaseCRUD):
             workflow_stats: Статистика выполнения workflow
             reranker_model: Название используемой модели reranker
             session_uuid: UUID сессии анализа (опционально)
+            commit: Фиксировать ли транзакцию (False - фиксирует вызывающий код)
+            hydrate: Возвращать ORM-объекты; при False - строки RETURNING_COLUMNS
+                без создания объектов и загрузки JSON-полей
             
         Returns:
             Список созданных записей анализа
@@ -55,23 +221,36 @@ class RerankerAnalysisResultCRUD(BaseCRUD):
         if not job:
             raise ValueError(f"Вакансия не найдена: {job_id}")
         
-        results = []
+        # Заявки вместе с кандидатами загружаем одним запросом до формирования строк
+        submission_ids = set()
+        for match in enhanced_matches:
+            try:
+                submission_ids.add(UUID(str(match.get('submission_id'))))
+            except ValueError:
+                continue
+        
+        submissions = db.query(Submission).options(
+            selectinload(Submission.candidate)
+        ).filter(Submission.submission_id.in_(submission_ids)).all() if submission_ids else []
+        submissions_by_id = {str(submission.submission_id): submission for submission in submissions}
+        
+        rows = []
         for rank, match in enumerate(enhanced_matches, 1):
             submission_id = match.get('submission_id')
             if not submission_id:
                 continue
                 
             # Получаем информацию о кандидате
-            submission = SubmissionCRUD.get_by_id(db, submission_id)
+            submission = submissions_by_id.get(str(submission_id))
             if not submission or not submission.candidate:
                 continue
             
             quality_metrics = match.get('quality_metrics', {})
             
             # Создаем запись анализа
-            analysis_data = {
+            rows.append({
                 'job_id': job_id,
-                'submission_id': submission_id,
+                'submission_id': submission.submission_id,
                 'original_similarity': quality_metrics.get('original_similarity', 0),
                 'rerank_score': quality_metrics.get('rerank_score', 0),
                 'final_score': match.get('final_score', 0),
@@ -87,13 +266,80 @@ class RerankerAnalysisResultCRUD(BaseCRUD):
                 'total_candidates_found': len(enhanced_matches),
                 'analysis_type': 'enhanced_resume_search',
                 'quality_metrics': quality_metrics
-            }
-            
-            result = self.create(db, analysis_data)
-            results.append(result)
+            })
         
+        rows = unique_analysis_rows(rows)
+        if not rows:
+            return []
+        
+        columns = [getattr(self.model, name) for name in self.RETURNING_COLUMNS]
+        if len(rows) > self.COPY_THRESHOLD:
+            self.bulk_copy_insert(db, rows)
+            # Записанные строки выбираются по явному ключу: processed_at по умолчанию
+            # равен времени начала транзакции (now()), а пары (job_id, submission_id)
+            # уникальны в пакете, поэтому строки, ранее записанные в этой же
+            # транзакции для других заявок, в выборку не попадают
+            query = select(self.model) if hydrate else select(*columns)
+            query = query.where(
+                self.model.job_id == job_id,
+                self.model.submission_id.in_([row['submission_id'] for row in rows]),
+                self.model.processed_at == func.now()
+            ).order_by(asc(self.model.rank_position))
+            results = db.scalars(query).all() if hydrate else db.execute(query).all()
+        elif hydrate:
+            # Один INSERT ... RETURNING на все записи вместо commit и refresh на каждую
+            results = db.scalars(insert(self.model).returning(self.model), rows).all()
+        else:
+            results = db.execute(insert(self.model).returning(*columns), rows).all()
+        if commit:
+            db.commit()
+            invalidate_job_summary(job_id)
         return results
     
+    def create_session_with_results(
+        self,
+        db: Session,
+        job_id: int,
+        company_id: int,
+        enhanced_matches: List[Dict[str, Any]],
+        search_params: Dict[str, Any],
+        workflow_stats: Dict[str, Any],
+        reranker_model: str,
+        started_at: datetime,
+        completed_at: Optional[datetime] = None,
+        hydrate: bool = True
+    ) -> Tuple[RerankerAnalysisSession, List[Any]]:
+        """
+        Создание сессии анализа и ее результатов в одной транзакции
+        
+        Сессия и результаты фиксируются одним commit вместо двух
+        (create_session + create_from_enhanced_search).
+        
+        Returns:
+            Кортеж (сессия, список записей анализа)
+        """
+        session = RerankerAnalysisSession(
+            session_uuid=uuid4(),
+            job_id=job_id,
+            company_id=company_id,
+            total_results=len(enhanced_matches),
+            search_params=search_params,
+            reranker_model=reranker_model,
+            session_stats=workflow_stats,
+            started_at=started_at,
+            completed_at=completed_at or datetime.utcnow()
+        )
+        db.add(session)
+        
+        results = self.create_from_enhanced_search(
+            db, job_id, enhanced_matches, search_params, workflow_stats,
+            reranker_model, session_uuid=str(session.session_uuid), commit=False,
+            hydrate=hydrate
+        )
+        db.commit()
+        invalidate_job_summary(job_id)
+        return session, results
+    
     def get_by_job(
         self,
         db: Session,
@@ -138,14 +384,21 @@ class RerankerAnalysisResultCRUD(BaseCRUD):
         job_id: int,
         limit: Optional[int] = 20
     ) -> List[RerankerAnalysisResult]:
-        """Получение последних результатов анализа для вакансии"""
+        """
+        Получение последних результатов анализа для вакансии
+        
+        Загружаются только колонки, нужные для to_summary_dict: JSON-поля
+        (search_params, workflow_stats, quality_metrics) не читаются.
+        """
         subquery = db.query(
             func.max(self.model.processed_at).label('latest_processed')
         ).filter(
             self.model.job_id == job_id
         ).scalar_subquery()
         
-        query = db.query(self.model).filter(
+        query = db.query(self.model).options(
+            load_only(*self.summary_columns())
+        ).filter(
             and_(
                 self.model.job_id == job_id,
                 self.model.processed_at == subquery
@@ -185,16 +438,22 @@ class RerankerAnalysisResultCRUD(BaseCRUD):
         end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """Получение аналитики по вакансии"""
-        query = db.query(self.model).filter(self.model.job_id == job_id)
-        
+        # Агрегаты считаются в PostgreSQL, строки результатов в Python не загружаются
+        filters = [self.model.job_id == job_id]
         if start_date:
-            query = query.filter(self.model.processed_at >= start_date)
+            filters.append(self.model.processed_at >= start_date)
         if end_date:
-            query = query.filter(self.model.processed_at <= end_date)
+            filters.append(self.model.processed_at <= end_date)
         
-        results = query.all()
+        total, avg_rerank_score, avg_improvement, top_score, latest_processed = db.query(
+            func.count(self.model.analysis_id),
+            func.avg(self.model.rerank_score),
+            func.avg(self.model.score_improvement),
+            func.max(self.model.rerank_score),
+            func.max(self.model.processed_at)
+        ).filter(*filters).one()
         
-        if not results:
+        if not total:
             return {
                 'total_analyses': 0,
                 'avg_rerank_score': 0,
@@ -203,29 +462,38 @@ class RerankerAnalysisResultCRUD(BaseCRUD):
                 'analyses_count_by_date': {}
             }
         
-        # Базовая статистика
-        rerank_scores = [float(r.rerank_score) for r in results]
-        improvements = [float(r.score_improvement) for r in results]
-        
         # Группировка по датам
-        analyses_by_date = {}
-        for result in results:
-            date_key = result.processed_at.date().isoformat()
-            analyses_by_date[date_key] = analyses_by_date.get(date_key, 0) + 1
+        processed_date = func.date(self.model.processed_at)
+        analyses_by_date = {
+            date_value.isoformat(): count
+            for date_value, count in db.query(processed_date, func.count(self.model.analysis_id))
+            .filter(*filters)
+            .group_by(processed_date)
+        }
         
         return {
-            'total_analyses': len(results),
-            'avg_rerank_score': sum(rerank_scores) / len(rerank_scores),
-            'avg_improvement': sum(improvements) / len(improvements),
-            'top_score': max(rerank_scores),
+            'total_analyses': total,
+            'avg_rerank_score': float(avg_rerank_score),
+            'avg_improvement': float(avg_improvement),
+            'top_score': float(top_score),
             'analyses_count_by_date': analyses_by_date,
-            'latest_analysis': results[-1].processed_at.isoformat() if results else None
+            'latest_analysis': latest_processed.isoformat() if latest_processed else None
         }
+    
+    def delete_older_than(self, db: Session, cutoff_date: datetime, batch_size: int = 1000) -> int:
+        """Удаление результатов анализа старше cutoff_date, возвращает число удаленных записей"""
+        return _delete_older_than(db, self.model, self.model.analysis_id, cutoff_date, batch_size)
 
 
 class RerankerAnalysisSessionCRUD(BaseCRUD):
     """CRUD операции для сессий анализа BGE Reranker"""
     
+    # Поля сессии, попадающие в сводку анализа (без тяжелых JSON-полей)
+    SUMMARY_FIELDS = (
+        'session_id', 'session_uuid', 'job_id', 'company_id', 'total_results',
+        'reranker_model', 'started_at', 'completed_at',
+    )
+    
     def __init__(self):
         super().__init__(RerankerAnalysisSession)
     
@@ -253,25 +521,138 @@ class RerankerAnalysisSessionCRUD(BaseCRUD):
             'completed_at': completed_at or datetime.utcnow()
         }
         
-        return self.create(db, session_data)
+        session = self.create(db, session_data)
+        invalidate_job_summary(job_id)
+        return session
     
     def get_recent_sessions(
         self,
         db: Session,
         limit: int = 20,
-        job_id: Optional[int] = None
+        job_id: Optional[int] = None,
+        summary_only: bool = False
     ) -> List[RerankerAnalysisSession]:
-        """Получение последних сессий анализа"""
+        """
+        Получение последних сессий анализа
+        
+        При summary_only=True JSON-поля search_params и session_stats не загружаются.
+        """
         query = db.query(self.model)
         
+        if summary_only:
+            query = query.options(load_only(*(getattr(self.model, field) for field in self.SUMMARY_FIELDS)))
+        
         if job_id:
             query = query.filter(self.model.job_id == job_id)
         
         return query.order_by(
             desc(self.model.completed_at)
         ).limit(limit).all()
+    
+    def delete_older_than(self, db: Session, cutoff_date: datetime, batch_size: int = 1000) -> int:
+        """Удаление сессий анализа старше cutoff_date, возвращает число удаленных записей"""
+        return _delete_older_than(db, self.model, self.model.session_id, cutoff_date, batch_size)
 
 
 # Создаем экземпляры CRUD
 reranker_analysis_result_crud = RerankerAnalysisResultCRUD()
 reranker_analysis_session_crud = RerankerAnalysisSessionCRUD()
+
+
+# Колонки сессии, которые не загружаются для сводки и не должны читаться to_dict
+_SESSION_SUMMARY_EXCLUDED = tuple(
+    name for name in RerankerAnalysisSession.__table__.columns.keys()
+    if name not in RerankerAnalysisSessionCRUD.SUMMARY_FIELDS
+)
+
+
+def _summary_cache_key(cache, job_id: int, limit: int) -> str:
+    """Ключ кэша сводки с учетом текущей версии данных вакансии"""
+    version = int(cache.get(f"analysis_summary_ver:{job_id}") or 0)
+    return f"analysis_summary:{job_id}:v{version}:{limit}"
+
+
+def get_cached_job_analysis_summary(job_id: int, limit: int = 20) -> Optional[Dict[str, Any]]:
+    """
+    Сводка анализа вакансии только из кэша, без обращения к базе данных
+    
+    Returns:
+        Сводка или None, если в кэше ее нет (или Redis недоступен)
+    """
+    cache = get_cache_client()
+    if cache is None:
+        return None
+    try:
+        cached = cache.get(_summary_cache_key(cache, job_id, limit))
+    except Exception as e:
+        report_cache_error(e)
+        logger.warning(f"⚠️ Ошибка чтения кэша сводки анализа: {e}")
+        return None
+    return json.loads(cached) if cached else None
+
+
+def get_job_analysis_summary(db: Optional[Session], job_id: int, limit: int = 20) -> Dict[str, Any]:
+    """
+    Сводка анализа по вакансии: последние результаты, аналитика и сессии
+    
+    Результат кэшируется в Redis по (job_id, limit) на SUMMARY_CACHE_TTL секунд;
+    запись новых результатов или сессий вакансии инвалидирует кэш.
+    При попадании в кэш база не используется; если db не передана, сессия
+    открывается только при промахе. При недоступном Redis сводка считается из базы.
+    """
+    cached = get_cached_job_analysis_summary(job_id, limit)
+    if cached is not None:
+        return cached
+    
+    if db is None:
+        from common.database.config import database
+        
+        db = database.get_session()
+        try:
+            return _compute_job_analysis_summary(db, job_id, limit)
+        finally:
+            db.close()
+    
+    return _compute_job_analysis_summary(db, job_id, limit)
+
+
+def _compute_job_analysis_summary(db: Session, job_id: int, limit: int) -> Dict[str, Any]:
+    """Расчет сводки анализа из базы и запись ее в кэш"""
+    # Версию берем до чтения из базы: если данные изменятся во время расчета,
+    # сводка попадет под устаревший ключ и не будет прочитана
+    cache = get_cache_client()
+    cache_key = None
+    if cache is not None:
+        try:
+            cache_key = _summary_cache_key(cache, job_id, limit)
+        except Exception as e:
+            report_cache_error(e)
+            logger.warning(f"⚠️ Ошибка чтения кэша сводки анализа: {e}")
+    
+    summary = {
+        'job_id': job_id,
+        'latest_results': [
+            result.to_summary_dict()
+            for result in reranker_analysis_result_crud.get_latest_by_job(db, job_id, limit)
+        ],
+        'analytics': reranker_analysis_result_crud.get_analytics_by_job(db, job_id),
+        'recent_sessions': [
+            session.to_dict(exclude_fields=_SESSION_SUMMARY_EXCLUDED)
+            for session in reranker_analysis_session_crud.get_recent_sessions(
+                db, limit=5, job_id=job_id, summary_only=True
+            )
+        ]
+    }
+    
+    if cache_key is not None:
+        try:
+            cache.setex(
+                cache_key,
+                SUMMARY_CACHE_TTL,
+                json.dumps(summary, ensure_ascii=False, default=str)
+            )
+        except Exception as e:
+            report_cache_error(e)
+            logger.warning(f"⚠️ Ошибка записи кэша сводки анализа: {e}")
+    
+    return summary
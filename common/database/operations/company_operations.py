@@ -41,6 +41,13 @@ class CompanyCRUD(BaseCRUD):
         """Получение компании по ID"""
         return CompanyCRUD._get_instance().get_by_id(db, company_id)
     
+    @staticmethod
+    def get_with_details(db: Session, company_id: int) -> Optional[Company]:
+        """Получение компании по ID вместе с контактами и отраслями"""
+        return db.query(Company).options(*Company.default_loads()).filter(
+            Company.company_id == company_id
+        ).first()
+    
     @staticmethod
     def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Company]:
         """Получение всех компаний с пагинацией"""
@@ -205,10 +212,15 @@ class JobCRUD:
         """Получение вакансии по ID"""
         return db.query(Job).filter(Job.job_id == job_id).first()
     
+    @staticmethod
+    def get_with_details(db: Session, job_id: int) -> Optional[Job]:
+        """Получение вакансии по ID вместе с компанией, компетенциями и кандидатами"""
+        return db.query(Job).options(*Job.default_loads()).filter(Job.job_id == job_id).first()
+    
     @staticmethod
     def get_by_company_id(db: Session, company_id: int, active_only: bool = True) -> List[Job]:
         """Получение всех вакансий компании"""
-        query = db.query(Job).filter(Job.company_id == company_id)
+        query = db.query(Job).options(*Job.list_loads()).filter(Job.company_id == company_id)
         if active_only:
             query = query.filter(Job.is_active == True)
         return query.order_by(desc(Job.created_at)).all()
@@ -216,18 +228,18 @@ class JobCRUD:
     @staticmethod
     def get_all_active(db: Session) -> List[Job]:
         """Получение всех активных вакансий"""
-        return db.query(Job).filter(Job.is_active == True).order_by(desc(Job.created_at)).all()
+        return db.query(Job).options(*Job.list_loads()).filter(Job.is_active == True).order_by(desc(Job.created_at)).all()
     
     @staticmethod
     def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Job]:
         """Получение всех вакансий с пагинацией"""
-        return db.query(Job).offset(skip).limit(limit).order_by(desc(Job.created_at)).all()
+        return db.query(Job).options(*Job.list_loads()).offset(skip).limit(limit).order_by(desc(Job.created_at)).all()
     
     @staticmethod
     def search(db: Session, title: str = None, location: str = None, 
                employment_type: str = None, experience_level: str = None) -> List[Job]:
         """Поиск вакансий по критериям"""
-        query = db.query(Job).filter(Job.is_active == True)
+        query = db.query(Job).options(*Job.list_loads()).filter(Job.is_active == True)
         
         if title:
             query = query.filter(Job.title.ilike(f"%{title}%"))
@@ -5,7 +5,8 @@ CRUD операции для работы с эмбеддингами
 import uuid
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from .base_crud import BaseCRUD
 from common.models.embeddings import EmbeddingMetadata
@@ -38,6 +39,23 @@ class EmbeddingCRUD(BaseCRUD):
             self.model.collection_name == collection_name
         ).all()
     
+    def get_chroma_ids_by_sources(
+        self,
+        db: Session,
+        source_type: str,
+        source_ids: List[str]
+    ) -> Dict[str, str]:
+        """Получить chroma_document_id существующих эмбеддингов источников одним запросом IN (...)"""
+        if not source_ids:
+            return {}
+        rows = db.query(self.model.source_id, self.model.chroma_document_id).filter(
+            and_(
+                self.model.source_type == source_type,
+                self.model.source_id.in_(source_ids)
+            )
+        ).all()
+        return {row.source_id: row.chroma_document_id for row in rows}
+    
     def create_embedding_metadata(
         self,
         db: Session,
@@ -80,6 +98,53 @@ class EmbeddingCRUD(BaseCRUD):
         db.refresh(embedding_metadata)
         return embedding_metadata
     
+    def bulk_create_embedding_metadata(
+        self,
+        db: Session,
+        rows: List[Dict[str, Any]],
+        commit: bool = True
+    ) -> int:
+        """
+        Создать или обновить метаданные пакета эмбеддингов одним запросом
+        
+        Вместо SELECT + commit + refresh на каждую запись выполняется один
+        INSERT ... ON CONFLICT (source_type, source_id) DO UPDATE на весь пакет.
+        
+        Args:
+            db: Сессия базы данных
+            rows: Словари с полями create_embedding_metadata
+            commit: Фиксировать ли транзакцию (False - фиксирует вызывающий код)
+            
+        Returns:
+            Количество записанных строк
+        """
+        # Повтор источника в одном INSERT ... ON CONFLICT недопустим, остается последний
+        unique_rows = {(row['source_type'], row['source_id']): row for row in rows}
+        if not unique_rows:
+            return 0
+        
+        values = [
+            {**row, 'additional_metadata': row.get('additional_metadata') or {}}
+            for row in unique_rows.values()
+        ]
+        stmt = pg_insert(self.model)
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_embedding_source',
+            set_={
+                'chroma_document_id': stmt.excluded.chroma_document_id,
+                'collection_name': stmt.excluded.collection_name,
+                'text_content': stmt.excluded.text_content,
+                'model_name': stmt.excluded.model_name,
+                'additional_metadata': stmt.excluded.additional_metadata,
+                'updated_at': func.now()
+            }
+        )
+        db.execute(stmt, values)
+        
+        if commit:
+            db.commit()
+        return len(values)
+    
     def delete_by_source(self, db: Session, source_type: str, source_id: str) -> bool:
         """Удалить эмбеддинг по источнику"""
         embedding = self.get_by_source(db, source_type, source_id)
@@ -103,7 +168,7 @@ class EmbeddingCRUD(BaseCRUD):
             )
         ).all()
         
-        existing_source_ids = [emb.source_id for emb in existing_embeddings]
+        existing_source_ids = {emb.source_id for emb in existing_embeddings}
         return [source_id for source_id in source_ids if source_id not in existing_source_ids]
 
 
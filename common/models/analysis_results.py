@@ -7,6 +7,7 @@
 from .base import *
 from sqlalchemy import JSON, DECIMAL, Index, ForeignKey, UniqueConstraint, CheckConstraint
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import text
 
 
 class RerankerAnalysisResult(Base):
@@ -48,8 +49,8 @@ class RerankerAnalysisResult(Base):
     # Метаданные
     total_candidates_found = Column(Integer, nullable=False)
     analysis_type = Column(String(50), nullable=False, default='enhanced_resume_search')
-    processed_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.current_timestamp())
-    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.current_timestamp())
+    processed_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('CURRENT_TIMESTAMP'))
     
     # Дополнительные метрики (опциональные)
     quality_metrics = Column(JSON)  # Дополнительные метрики качества
@@ -148,8 +149,8 @@ class RerankerAnalysisSession(Base):
     
     # Временные метки
     started_at = Column(TIMESTAMP(timezone=True), nullable=False)
-    completed_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.current_timestamp())
-    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.current_timestamp())
+    completed_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('CURRENT_TIMESTAMP'))
     
     # Constraints
     __table_args__ = (
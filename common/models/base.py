@@ -12,6 +12,7 @@ from sqlalchemy import (
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from .utils import SENSITIVE_FIELDS, SCALAR_SERIALIZERS
 
 # Базовый класс для всех моделей
 BaseModel = declarative_base()
@@ -21,6 +22,15 @@ class Base(BaseModel):
     """Расширенный базовый класс с утилитами"""
     __abstract__ = True
     
+    @classmethod
+    def _column_names(cls) -> tuple:
+        """Имена колонок модели (кэшируется на класс)"""
+        names = cls.__dict__.get('_cached_columns')
+        if names is None:
+            names = tuple(column.name for column in cls.__table__.columns)
+            cls._cached_columns = names
+        return names
+    
     def to_dict(self, exclude_fields: Optional[list] = None) -> Dict[str, Any]:
         """
         Преобразует объект модели в словарь
@@ -31,31 +41,35 @@ class Base(BaseModel):
         Returns:
             Словарь с данными модели
         """
-        exclude_fields = exclude_fields or []
-        result = {}
-        
-        for column in self.__table__.columns:
-            field_name = column.name
-            if field_name in exclude_fields:
-                continue
-                
-            value = getattr(self, field_name)
-            result[field_name] = self._serialize_value(value)
-            
-        return result
+        exclude_fields = exclude_fields or ()
+        serialize = self._serialize_value
+        return {
+            field_name: serialize(getattr(self, field_name))
+            for field_name in self._column_names()
+            if field_name not in exclude_fields
+        }
     
     def _serialize_value(self, value: Any) -> Any:
         """Сериализует значение в JSON-совместимый формат"""
         if value is None:
             return None
-        elif isinstance(value, datetime):
-            return value.isoformat()
-        elif isinstance(value, uuid.UUID):
-            return str(value)
-        elif hasattr(value, 'to_dict'):
+        
+        serializer = SCALAR_SERIALIZERS.get(type(value))
+        if serializer is not None:
+            return serializer(value)
+        if hasattr(value, 'to_dict'):
             return value.to_dict()
-        else:
-            return value
+        return value
+    
+    @classmethod
+    def _sensitive_fields_present(cls) -> frozenset:
+        """Конфиденциальные поля, которые есть среди колонок модели (кэшируется на класс)"""
+        present = cls.__dict__.get('_sensitive_present')
+        if present is None:
+            columns = {column.name for column in cls.__table__.columns} if hasattr(cls, '__table__') else set()
+            present = frozenset(field for field in SENSITIVE_FIELDS if field in columns)
+            cls._sensitive_present = present
+        return present
     
     def to_safe_dict(self) -> Dict[str, Any]:
         """
@@ -64,25 +78,24 @@ class Base(BaseModel):
         Returns:
             Словарь с замаскированными конфиденциальными полями
         """
-        sensitive_fields = ['email', 'phone', 'mobile_number', 'linkedin_url']
+        sensitive_fields = self._sensitive_fields_present()
         result = self.to_dict()
+        if not sensitive_fields:
+            return result
         
         for field in sensitive_fields:
-            if field in result and result[field]:
+            if result.get(field):
                 result[field] = self._mask_sensitive_data(result[field])
                 
         return result
     
     def _mask_sensitive_data(self, value: str) -> str:
         """Маскирует конфиденциальные данные"""
-        if '@' in str(value):  # email
-            parts = str(value).split('@')
-            if len(parts) == 2:
-                return f"{parts[0][:2]}***@{parts[1]}"
-        elif str(value).startswith(('http', 'www')):  # URL
-            return '***'
-        elif any(char.isdigit() for char in str(value)):  # phone
-            return '***'
+        text_value = value if isinstance(value, str) else str(value)
+        at = text_value.find('@')
+        if at != -1 and text_value.find('@', at + 1) == -1:  # email
+            return f"{text_value[:min(at, 2)]}***@{text_value[at + 1:]}"
+        # URL, телефон и прочие значения маскируются полностью
         return '***'
 
 
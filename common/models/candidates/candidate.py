@@ -6,7 +6,7 @@ from typing import Optional, List, Dict, Any
 from sqlalchemy import Column, Integer, String, Text, Boolean
 from sqlalchemy.orm import relationship
 from ..base import Base
-from ..utils import TimestampMixin, ModelConstraints
+from ..utils import TimestampMixin, ModelConstraints, safe_email_validate
 
 
 class Candidate(Base, TimestampMixin):
@@ -48,10 +48,7 @@ class Candidate(Base, TimestampMixin):
     
     def validate_email(self) -> bool:
         """Валидация email"""
-        email_value = getattr(self, 'email', None)
-        if not email_value:
-            return False
-        return '@' in email_value and '.' in email_value.split('@')[-1]
+        return safe_email_validate(getattr(self, 'email', None))
     
     def has_linkedin(self) -> bool:
         """Проверка наличия LinkedIn профиля"""
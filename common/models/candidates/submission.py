@@ -59,7 +59,7 @@ class Submission(Base):
     # Constraints с использованием констант
     __table_args__ = (
         CheckConstraint(
-            f"status IN {tuple(ModelConstraints.CANDIDATE_STATUSES)}",
+            f"status IN {ModelConstraints.CANDIDATE_STATUSES}",
             name='ck_submission_status'
         ),
     )
@@ -96,7 +96,7 @@ class Submission(Base):
     def is_status_valid(self) -> bool:
         """Проверка валидности статуса"""
         status_value = getattr(self, 'status', None)
-        return status_value in ModelConstraints.CANDIDATE_STATUSES
+        return status_value in ModelConstraints.CANDIDATE_STATUSES_SET
     
     def has_valid_agreements(self) -> bool:
         """Проверка обязательных согласий"""
@@ -2,12 +2,13 @@
 Модели компаний
 """
 
-from typing import Optional, List, Dict, Any
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, UniqueConstraint
-from sqlalchemy.orm import relationship
+from typing import Optional, List, Dict, Any, Iterable
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.orm import relationship, Session, selectinload
 from sqlalchemy.sql import func
 from ..base import Base
-from ..utils import TimestampMixin, ModelConstraints
+from ..utils import TimestampMixin, ModelConstraints, safe_email_validate, COLLECTION_LAZY
+from .job import Job
 
 
 class Company(Base, TimestampMixin):
@@ -20,22 +21,82 @@ class Company(Base, TimestampMixin):
     description = Column(Text)
     
     # Relationships
+    # Коллекции загружаются лениво; для списков используйте selectinload(Company.jobs)
     contacts = relationship("CompanyContact", back_populates="company", cascade="all, delete-orphan")
     industries = relationship("CompanyIndustry", back_populates="company", cascade="all, delete-orphan")
-    jobs = relationship("Job", back_populates="company", cascade="all, delete-orphan")
+    jobs = relationship("Job", back_populates="company", cascade="all, delete-orphan", lazy=COLLECTION_LAZY)
     hiring_stages = relationship("HiringStage", back_populates="company", cascade="all, delete-orphan")
     custom_values = relationship("CustomValue", back_populates="company", cascade="all, delete-orphan")
     
+    # Счетчики, предзагруженные через annotate_counts()
+    _jobs_count_cached = None
+    _contacts_count_cached = None
+    
     def __repr__(self) -> str:
         return f"<Company(id={self.company_id}, name='{self.name}')>"
     
+    @classmethod
+    def default_loads(cls) -> tuple:
+        """
+        Стратегии загрузки для полного чтения компании
+        
+        Используется в запросах как query.options(*Company.default_loads()).
+        Опции строятся лениво: на этапе импорта маперы еще не сконфигурированы.
+        """
+        loads = cls.__dict__.get('_default_loads')
+        if loads is None:
+            loads = (
+                selectinload(cls.contacts),
+                selectinload(cls.industries).joinedload(CompanyIndustry.industry),
+            )
+            cls._default_loads = loads
+        return loads
+    
+    @classmethod
+    def annotate_counts(cls, db: Session, companies: Iterable['Company']) -> None:
+        """
+        Предзагружает количество вакансий и контактов для набора компаний
+        
+        Выполняет по одному GROUP BY запросу вместо загрузки коллекций
+        у каждой компании при вызове to_safe_dict().
+        
+        Args:
+            db: Сессия базы данных
+            companies: Компании для аннотирования
+        """
+        companies = list(companies)
+        ids = [company.company_id for company in companies]
+        if not ids:
+            return
+        
+        jobs_counts = dict(
+            db.query(Job.company_id, func.count(Job.job_id))
+            .filter(Job.company_id.in_(ids))
+            .group_by(Job.company_id)
+            .all()
+        )
+        contacts_counts = dict(
+            db.query(CompanyContact.company_id, func.count(CompanyContact.contact_id))
+            .filter(CompanyContact.company_id.in_(ids))
+            .group_by(CompanyContact.company_id)
+            .all()
+        )
+        
+        for company in companies:
+            company._jobs_count_cached = jobs_counts.get(company.company_id, 0)
+            company._contacts_count_cached = contacts_counts.get(company.company_id, 0)
+    
     def to_safe_dict(self) -> Dict[str, Any]:
         """Безопасная сериализация компании"""
         result = super().to_safe_dict()
-        # Добавляем подсчет связанных объектов
-        if hasattr(self, 'jobs'):
+        # Добавляем подсчет связанных объектов (предзагруженный, если есть)
+        if self._jobs_count_cached is not None:
+            result['jobs_count'] = self._jobs_count_cached
+        elif hasattr(self, 'jobs'):
             result['jobs_count'] = len(self.jobs) if self.jobs else 0
-        if hasattr(self, 'contacts'):
+        if self._contacts_count_cached is not None:
+            result['contacts_count'] = self._contacts_count_cached
+        elif hasattr(self, 'contacts'):
             result['contacts_count'] = len(self.contacts) if self.contacts else 0
         return result
 
@@ -55,6 +116,7 @@ class CompanyContact(Base, TimestampMixin):
     # Constraints
     __table_args__ = (
         UniqueConstraint('company_id', 'email', name='uq_company_contact_email'),
+        Index('idx_company_contacts_company_primary', 'company_id', 'is_primary'),
     )
     
     # Relationships
@@ -70,10 +132,7 @@ class CompanyContact(Base, TimestampMixin):
     
     def validate_email(self) -> bool:
         """Валидация email"""
-        email_value = getattr(self, 'email', None)
-        if not email_value:
-            return False
-        return '@' in email_value and '.' in email_value.split('@')[-1]
+        return safe_email_validate(getattr(self, 'email', None))
 
 
 class CompanyIndustry(Base):
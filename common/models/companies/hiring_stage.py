@@ -5,10 +5,11 @@
 from typing import Optional, List, Dict, Any
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, DateTime, ForeignKey, 
-    CheckConstraint, SmallInteger, UniqueConstraint
+    SmallInteger, UniqueConstraint, Index
 )
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.sql import text
 from ..base import Base
 from ..utils import TimestampMixin, ModelConstraints
 
@@ -20,10 +21,14 @@ class HiringStage(Base):
     stage_id = Column(Integer, primary_key=True, autoincrement=True)
     company_id = Column(Integer, ForeignKey('companies.company_id', ondelete='CASCADE'), nullable=False)
     name = Column(String(100), nullable=False)
-    description = Column(Text)
+    description = deferred(Column(Text), group='heavy_text')
     position = Column(SmallInteger, nullable=False)
     is_default = Column(Boolean, nullable=False, default=False)
-    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.current_timestamp())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    
+    __table_args__ = (
+        Index('idx_hiring_stages_company_position', 'company_id', 'position'),
+    )
     
     # Relationships
     company = relationship("Company", back_populates="hiring_stages")
@@ -49,25 +54,25 @@ class CandidateAction(Base):
     action_id = Column(Integer, primary_key=True, autoincrement=True)
     candidate_id = Column(Integer, ForeignKey('job_candidates.candidate_id', ondelete='CASCADE'), nullable=False)
     stage_id = Column(Integer, ForeignKey('hiring_stages.stage_id'), nullable=False)
-    action_type = Column(String(50))
-    action_date = Column(DateTime(timezone=True), nullable=False, server_default=func.current_timestamp())
+    
+    # Типы действий вынесены в константы и хранятся нативным PostgreSQL ENUM
+    ACTION_TYPES = ('interview', 'assessment', 'offer', 'rejection', 'note', 'review', 'follow_up')
+    ACTION_TYPES_SET = frozenset(ACTION_TYPES)
+    
+    action_type = Column(ENUM(*ACTION_TYPES, name='action_type_enum', create_type=True))
+    action_date = Column(DateTime(timezone=True), nullable=False, server_default=text('CURRENT_TIMESTAMP'))
     notes = Column(Text)
     completed = Column(Boolean, nullable=False, default=False)
     assigned_to = Column(Integer, ForeignKey('company_contacts.contact_id', ondelete='SET NULL'))
     
-    # Constraints - типы действий вынесены в константы
-    ACTION_TYPES = ['interview', 'assessment', 'offer', 'rejection', 'note', 'review', 'follow_up']
-    
     __table_args__ = (
-        CheckConstraint(
-            f"action_type IN {tuple(ACTION_TYPES)}",
-            name='ck_action_type'
-        ),
+        Index('idx_candidate_actions_candidate_completed', 'candidate_id', 'completed'),
+        Index('idx_candidate_actions_assignee', 'assigned_to'),
     )
     
     # Relationships
-    candidate = relationship("JobCandidate", back_populates="actions")
-    stage = relationship("HiringStage", back_populates="actions")
+    candidate = relationship("JobCandidate", back_populates="actions", lazy='selectin')
+    stage = relationship("HiringStage", back_populates="actions", lazy='selectin')
     assignee = relationship("CompanyContact", back_populates="assigned_actions")
     
     def __repr__(self) -> str:
@@ -76,7 +81,7 @@ class CandidateAction(Base):
     def is_action_type_valid(self) -> bool:
         """Проверка валидности типа действия"""
         action_type_value = getattr(self, 'action_type', None)
-        return action_type_value in self.ACTION_TYPES
+        return action_type_value in self.ACTION_TYPES_SET
 
 
 class CustomValue(Base, TimestampMixin):
@@ -85,15 +90,16 @@ class CustomValue(Base, TimestampMixin):
     
     custom_value_id = Column(Integer, primary_key=True, autoincrement=True)
     company_id = Column(Integer, ForeignKey('companies.company_id', ondelete='CASCADE'))
-    type = Column(String(20), nullable=False)
+    
+    # Типы значений вынесены в константы и хранятся нативным PostgreSQL ENUM
+    VALUE_TYPES = ('industry', 'competency', 'skill', 'technology', 'location')
+    VALUE_TYPES_SET = frozenset(VALUE_TYPES)
+    
+    type = Column(ENUM(*VALUE_TYPES, name='custom_value_type_enum', create_type=True), nullable=False)
     value = Column(String(ModelConstraints.MAX_NAME_LENGTH), nullable=False)
     created_by = Column(Integer, ForeignKey('company_contacts.contact_id', ondelete='SET NULL'))
     
-    # Constraints - типы значений вынесены в константы
-    VALUE_TYPES = ['industry', 'competency', 'skill', 'technology', 'location']
-    
     __table_args__ = (
-        CheckConstraint(f"type IN {tuple(VALUE_TYPES)}", name='ck_custom_value_type'),
         UniqueConstraint('company_id', 'type', 'value', name='uq_company_custom_value'),
     )
     
@@ -107,4 +113,4 @@ class CustomValue(Base, TimestampMixin):
     def is_type_valid(self) -> bool:
         """Проверка валидности типа значения"""
         type_value = getattr(self, 'type', None)
-        return type_value in self.VALUE_TYPES
+        return type_value in self.VALUE_TYPES_SET
@@ -2,15 +2,22 @@
 Модели вакансий и связанных сущностей
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, DateTime, ForeignKey, 
-    CheckConstraint, SmallInteger, UniqueConstraint
+    CheckConstraint, SmallInteger, UniqueConstraint, Index
 )
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship, deferred, Session, selectinload, joinedload
+from sqlalchemy.dialects.postgresql import ENUM
+from sqlalchemy.sql import func, text
 from ..base import Base
-from ..utils import TimestampMixin, ModelConstraints
+from ..utils import TimestampMixin, ModelConstraints, COLLECTION_LAZY
+
+
+# Нативные PostgreSQL ENUM типы вместо CheckConstraint с IN-списками
+EmploymentTypeEnum = ENUM(*ModelConstraints.EMPLOYMENT_TYPES, name='employment_type_enum', create_type=True)
+ExperienceLevelEnum = ENUM(*ModelConstraints.EXPERIENCE_LEVELS, name='experience_level_enum', create_type=True)
+ApplicationStatusEnum = ENUM(*ModelConstraints.APPLICATION_STATUSES, name='application_status_enum', create_type=True)
 
 
 class Job(Base, TimestampMixin):
@@ -20,56 +27,107 @@ class Job(Base, TimestampMixin):
     job_id = Column(Integer, primary_key=True, autoincrement=True)
     company_id = Column(Integer, ForeignKey('companies.company_id', ondelete='CASCADE'), nullable=False)
     title = Column(String(ModelConstraints.MAX_TITLE_LENGTH), nullable=False)
-    description = Column(Text, nullable=False)
+    # Тяжелые текстовые поля загружаются отложенно одной группой
+    description = deferred(Column(Text, nullable=False), group='heavy_text')
     job_description_url = Column(String(ModelConstraints.MAX_URL_LENGTH))
-    job_description_raw_text = Column(Text)  # Сырой текст из PDF/DOCX
+    job_description_raw_text = deferred(Column(Text), group='heavy_text')  # Сырой текст из PDF/DOCX
     # Примечание: job_description_parsed_at перенесен в tasks для бизнес-логики
-    employment_type = Column(String(50))
-    experience_level = Column(String(50))
+    employment_type = Column(EmploymentTypeEnum)
+    experience_level = Column(ExperienceLevelEnum)
     salary_range = Column(String(100))
     currency = Column(String(3))
     location = Column(String(ModelConstraints.MAX_NAME_LENGTH))
     is_active = Column(Boolean, nullable=False, default=True)
     created_by = Column(Integer, ForeignKey('company_contacts.contact_id', ondelete='SET NULL'))
     
-    # Constraints с использованием констант
     __table_args__ = (
-        CheckConstraint(
-            f"employment_type IN {tuple(ModelConstraints.EMPLOYMENT_TYPES)}",
-            name='ck_job_employment_type'
-        ),
-        CheckConstraint(
-            f"experience_level IN {tuple(ModelConstraints.EXPERIENCE_LEVELS)}",
-            name='ck_job_experience_level'
-        ),
+        Index('idx_jobs_company_active', 'company_id', 'is_active'),
     )
     
     # Relationships
-    company = relationship("Company", back_populates="jobs")
+    # Компания нужна практически всегда - подгружаем сразу через JOIN.
+    # Коллекции загружаются лениво; для списков используйте selectinload(Job.candidates)
+    company = relationship("Company", back_populates="jobs", lazy='joined')
     creator = relationship("CompanyContact", back_populates="created_jobs")
     competencies = relationship("JobCompetency", back_populates="job", cascade="all, delete-orphan")
-    candidates = relationship("JobCandidate", back_populates="job", cascade="all, delete-orphan")
+    candidates = relationship("JobCandidate", back_populates="job", cascade="all, delete-orphan", lazy=COLLECTION_LAZY)
+    
+    # Счетчик, предзагруженный через annotate_counts()
+    _candidates_count_cached = None
     
     def __repr__(self) -> str:
         return f"<Job(id={self.job_id}, title='{self.title}', company_id={self.company_id})>"
     
+    @classmethod
+    def default_loads(cls) -> tuple:
+        """
+        Стратегии загрузки для полного чтения вакансии
+        
+        Используется в запросах как query.options(*Job.default_loads()).
+        Опции строятся лениво: на этапе импорта маперы еще не сконфигурированы.
+        """
+        loads = cls.__dict__.get('_default_loads')
+        if loads is None:
+            loads = (
+                joinedload(cls.company),
+                selectinload(cls.competencies).joinedload(JobCompetency.competency),
+                selectinload(cls.candidates),
+            )
+            cls._default_loads = loads
+        return loads
+    
+    @classmethod
+    def list_loads(cls) -> tuple:
+        """Стратегии загрузки для списков вакансий: только компания"""
+        loads = cls.__dict__.get('_list_loads')
+        if loads is None:
+            loads = (joinedload(cls.company),)
+            cls._list_loads = loads
+        return loads
+    
+    @classmethod
+    def annotate_counts(cls, db: Session, jobs: Iterable['Job']) -> None:
+        """
+        Предзагружает количество кандидатов для набора вакансий одним GROUP BY запросом
+        
+        Args:
+            db: Сессия базы данных
+            jobs: Вакансии для аннотирования
+        """
+        jobs = list(jobs)
+        ids = [job.job_id for job in jobs]
+        if not ids:
+            return
+        
+        counts = dict(
+            db.query(JobCandidate.job_id, func.count(JobCandidate.candidate_id))
+            .filter(JobCandidate.job_id.in_(ids))
+            .group_by(JobCandidate.job_id)
+            .all()
+        )
+        
+        for job in jobs:
+            job._candidates_count_cached = counts.get(job.job_id, 0)
+    
     def to_safe_dict(self) -> Dict[str, Any]:
         """Безопасная сериализация вакансии"""
         result = super().to_safe_dict()
-        # Добавляем подсчет кандидатов
-        if hasattr(self, 'candidates'):
+        # Добавляем подсчет кандидатов (предзагруженный, если есть)
+        if self._candidates_count_cached is not None:
+            result['candidates_count'] = self._candidates_count_cached
+        elif hasattr(self, 'candidates'):
             result['candidates_count'] = len(self.candidates) if self.candidates else 0
         return result
     
     def is_employment_type_valid(self) -> bool:
         """Проверка валидности типа занятости"""
         employment_type_value = getattr(self, 'employment_type', None)
-        return employment_type_value in ModelConstraints.EMPLOYMENT_TYPES
+        return employment_type_value in ModelConstraints.EMPLOYMENT_TYPES_SET
     
     def is_experience_level_valid(self) -> bool:
         """Проверка валидности уровня опыта"""
         experience_level_value = getattr(self, 'experience_level', None)
-        return experience_level_value in ModelConstraints.EXPERIENCE_LEVELS
+        return experience_level_value in ModelConstraints.EXPERIENCE_LEVELS_SET
 
 
 class JobCompetency(Base):
@@ -105,22 +163,19 @@ class JobCandidate(Base):
     resume_url = Column(String(ModelConstraints.MAX_URL_LENGTH), nullable=False)
     linkedin_url = Column(String(ModelConstraints.MAX_URL_LENGTH))
     current_stage_id = Column(Integer, ForeignKey('hiring_stages.stage_id', ondelete='SET NULL'))
-    application_date = Column(DateTime(timezone=True), nullable=False, server_default=func.current_timestamp())
-    status = Column(String(50))
-    notes = Column(Text)
+    application_date = Column(DateTime(timezone=True), nullable=False, server_default=text('CURRENT_TIMESTAMP'))
+    status = Column(ApplicationStatusEnum)
+    notes = deferred(Column(Text), group='heavy_text')
     
-    # Constraints с использованием констант
     __table_args__ = (
         UniqueConstraint('job_id', 'email', name='uq_job_candidate_email'),
-        CheckConstraint(
-            f"status IN {tuple(ModelConstraints.APPLICATION_STATUSES)}",
-            name='ck_candidate_status'
-        ),
+        Index('idx_job_candidates_job_status', 'job_id', 'status'),
+        Index('idx_job_candidates_current_stage', 'current_stage_id'),
     )
     
     # Relationships
-    job = relationship("Job", back_populates="candidates")
-    current_stage = relationship("HiringStage", back_populates="candidates")
+    job = relationship("Job", back_populates="candidates", lazy='selectin')
+    current_stage = relationship("HiringStage", back_populates="candidates", lazy='selectin')
     actions = relationship("CandidateAction", back_populates="candidate", cascade="all, delete-orphan")
     
     def __repr__(self) -> str:
@@ -131,4 +186,4 @@ class JobCandidate(Base):
     def is_status_valid(self) -> bool:
         """Проверка валидности статуса"""
         status_value = getattr(self, 'status', None)
-        return status_value in ModelConstraints.APPLICATION_STATUSES
+        return status_value in ModelConstraints.APPLICATION_STATUSES_SET
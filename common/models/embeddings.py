@@ -2,10 +2,14 @@
 Модели для хранения метаданных эмбеддингов
 """
 
-from sqlalchemy import JSON, UniqueConstraint, Column, String, Text, TIMESTAMP, UUID, Index
-from sqlalchemy.sql import func
+from typing import Iterator
+from sqlalchemy import UniqueConstraint, Column, String, Text, TIMESTAMP, UUID, Index, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, Session
+from sqlalchemy.sql import text
 import uuid
 from .base import Base
+from .utils import utcnow
 
 class EmbeddingMetadata(Base):
     """Модель для хранения метаданных эмбеддингов"""
@@ -16,21 +20,43 @@ class EmbeddingMetadata(Base):
     source_id = Column(String(255), nullable=False)  # ID записи в источнике
     chroma_document_id = Column(String(255), nullable=False, unique=True)  # ID документа в ChromaDB
     collection_name = Column(String(100), nullable=False)  # Имя коллекции в ChromaDB
-    text_content = Column(Text, nullable=False)  # Сырой текст
+    text_content = deferred(Column(Text, nullable=False), group='heavy_text')  # Сырой текст
     model_name = Column(String(100), nullable=False, default='nomic-embed-text:latest')
-    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.current_timestamp())
-    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, default=utcnow, server_default=text('CURRENT_TIMESTAMP'))
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, default=utcnow, server_default=text('CURRENT_TIMESTAMP'), onupdate=utcnow)
     
-    # Дополнительные метаданные в JSON формате
-    additional_metadata = Column(JSON)
+    # Дополнительные метаданные в JSONB формате (индексируется GIN)
+    additional_metadata = Column(JSONB)
     
     # Составной индекс для быстрого поиска по источнику
     __table_args__ = (
         Index('idx_embedding_source', 'source_type', 'source_id'),
         Index('idx_embedding_chroma_id', 'chroma_document_id'),
         Index('idx_embedding_collection', 'collection_name'),
+        Index('idx_embedding_model_name', 'model_name'),
+        Index('idx_embedding_metadata_gin', 'additional_metadata', postgresql_using='gin'),
         UniqueConstraint('source_type', 'source_id', name='uq_embedding_source')
     )
     
     def __repr__(self):
         return f"<EmbeddingMetadata(id={self.embedding_id}, source={self.source_type}:{self.source_id})>"
+    
+    @classmethod
+    def stream_all(cls, db: Session, chunk_size: int = 1000) -> Iterator['EmbeddingMetadata']:
+        """
+        Потоковое чтение всех записей через серверный курсор
+        
+        Строки подгружаются порциями по chunk_size, поэтому память не зависит
+        от размера таблицы. Итератор нужно полностью прочитать в рамках той же
+        сессии/транзакции, до commit() или close().
+        
+        Args:
+            db: Сессия базы данных
+            chunk_size: Количество строк, загружаемых за одну порцию
+            
+        Returns:
+            Итератор по объектам EmbeddingMetadata
+        """
+        return db.execute(
+            select(cls).execution_options(stream_results=True, yield_per=chunk_size)
+        ).scalars()
@@ -2,29 +2,93 @@
 Утилиты для работы с моделями данных
 """
 
+import os
+import re
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Union
-from sqlalchemy import Column, TIMESTAMP, func
+from sqlalchemy import Column, TIMESTAMP, text
+
+
+# Стратегия загрузки для "тяжелых" коллекций (Company.jobs, Job.candidates).
+# По умолчанию ленивая; в тестах можно выставить MODELS_COLLECTION_LAZY=raise,
+# чтобы ловить обращения к коллекциям без явного selectinload(...) в запросе.
+COLLECTION_LAZY = os.getenv('MODELS_COLLECTION_LAZY', 'select')
+
+# Сериализаторы скалярных типов: поиск по type(value) вместо цепочки isinstance
+SCALAR_SERIALIZERS = {
+    datetime: datetime.isoformat,
+    uuid.UUID: str,
+}
+
+# Поля, которые маскируются при безопасной сериализации
+SENSITIVE_FIELDS = ('email', 'phone', 'mobile_number', 'linkedin_url')
+
+# Простая проверка формата email: local@domain.tld без пробелов
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+\Z')
+
+# Символы, которые сохраняются в номере телефона
+_PHONE_KEEP = frozenset('0123456789+')
+
+
+class _PhoneDeleteTable(dict):
+    """Таблица для str.translate: удаляет все символы, кроме цифр и '+'.
+
+    Для Latin-1 таблица заполняется заранее, остальные символы
+    добавляются лениво при первом появлении.
+    """
+
+    def __missing__(self, key: int) -> Optional[int]:
+        value = key if chr(key) in _PHONE_KEEP else None
+        self[key] = value
+        return value
+
+
+_PHONE_DEL_TABLE = _PhoneDeleteTable(
+    (code, code if chr(code) in _PHONE_KEEP else None) for code in range(256)
+)
+
+
+def utcnow() -> datetime:
+    """Текущее время в UTC (timezone-aware)"""
+    return datetime.now(timezone.utc)
 
 
 class TimestampMixin:
-    """Миксин для добавления полей created_at и updated_at"""
+    """Миксин для добавления полей created_at и updated_at
+
+    Python-side default позволяет ORM передавать время в VALUES и выполнять
+    bulk-вставки через executemany; server_default остается для raw SQL.
+    """
+    __slots__ = ()
+    
     created_at = Column(
         TIMESTAMP(timezone=True), 
         nullable=False, 
-        server_default=func.current_timestamp()
+        default=utcnow,
+        server_default=text('CURRENT_TIMESTAMP')
     )
     updated_at = Column(
         TIMESTAMP(timezone=True), 
         nullable=False, 
-        server_default=func.current_timestamp(), 
-        onupdate=func.current_timestamp()
+        default=utcnow,
+        server_default=text('CURRENT_TIMESTAMP'), 
+        onupdate=utcnow
     )
 
 
 class SerializationMixin:
     """Миксин для сериализации моделей в JSON-совместимый формат"""
+    __slots__ = ()
+    
+    @classmethod
+    def _column_names(cls) -> tuple:
+        """Имена колонок модели (кэшируется на класс)"""
+        names = cls.__dict__.get('_cached_columns')
+        if names is None:
+            names = tuple(column.name for column in cls.__table__.columns)
+            cls._cached_columns = names
+        return names
     
     def to_dict(self, exclude_fields: Optional[list] = None) -> Dict[str, Any]:
         """
@@ -36,32 +100,38 @@ class SerializationMixin:
         Returns:
             Словарь с данными модели
         """
-        exclude_fields = exclude_fields or []
-        result = {}
+        if not hasattr(self, '__table__'):
+            return {}
         
-        if hasattr(self, '__table__'):
-            for column in self.__table__.columns:
-                field_name = column.name
-                if field_name in exclude_fields:
-                    continue
-                    
-                value = getattr(self, field_name)
-                result[field_name] = self._serialize_value(value)
-            
-        return result
+        exclude_fields = exclude_fields or ()
+        serialize = self._serialize_value
+        return {
+            field_name: serialize(getattr(self, field_name))
+            for field_name in self._column_names()
+            if field_name not in exclude_fields
+        }
     
     def _serialize_value(self, value: Any) -> Any:
         """Сериализует значение в JSON-совместимый формат"""
         if value is None:
             return None
-        elif isinstance(value, datetime):
-            return value.isoformat()
-        elif isinstance(value, uuid.UUID):
-            return str(value)
-        elif hasattr(value, 'to_dict'):
+        
+        serializer = SCALAR_SERIALIZERS.get(type(value))
+        if serializer is not None:
+            return serializer(value)
+        if hasattr(value, 'to_dict'):
             return value.to_dict()
-        else:
-            return value
+        return value
+    
+    @classmethod
+    def _sensitive_fields_present(cls) -> frozenset:
+        """Конфиденциальные поля, которые есть среди колонок модели (кэшируется на класс)"""
+        present = cls.__dict__.get('_sensitive_present')
+        if present is None:
+            columns = {column.name for column in cls.__table__.columns} if hasattr(cls, '__table__') else set()
+            present = frozenset(field for field in SENSITIVE_FIELDS if field in columns)
+            cls._sensitive_present = present
+        return present
     
     def to_safe_dict(self) -> Dict[str, Any]:
         """
@@ -70,30 +140,30 @@ class SerializationMixin:
         Returns:
             Словарь с замаскированными конфиденциальными полями
         """
-        sensitive_fields = ['email', 'phone', 'mobile_number', 'linkedin_url']
+        sensitive_fields = self._sensitive_fields_present()
         result = self.to_dict()
+        if not sensitive_fields:
+            return result
         
         for field in sensitive_fields:
-            if field in result and result[field]:
+            if result.get(field):
                 result[field] = self._mask_sensitive_data(result[field])
                 
         return result
     
     def _mask_sensitive_data(self, value: str) -> str:
         """Маскирует конфиденциальные данные"""
-        if '@' in str(value):  # email
-            parts = str(value).split('@')
-            if len(parts) == 2:
-                return f"{parts[0][:2]}***@{parts[1]}"
-        elif str(value).startswith(('http', 'www')):  # URL
-            return '***'
-        elif any(char.isdigit() for char in str(value)):  # phone
-            return '***'
+        text_value = value if isinstance(value, str) else str(value)
+        at = text_value.find('@')
+        if at != -1 and text_value.find('@', at + 1) == -1:  # email
+            return f"{text_value[:min(at, 2)]}***@{text_value[at + 1:]}"
+        # URL, телефон и прочие значения маскируются полностью
         return '***'
 
 
 class ValidationMixin:
     """Миксин для валидации данных модели"""
+    __slots__ = ()
     
     def validate(self) -> tuple[bool, list[str]]:
         """
@@ -157,8 +227,7 @@ def safe_email_validate(email: str) -> bool:
     if not email or not isinstance(email, str):
         return False
     
-    email = email.strip().lower()
-    return '@' in email and '.' in email.split('@')[-1]
+    return _EMAIL_RE.match(email.strip()) is not None
 
 
 def format_phone_number(phone: Optional[str]) -> Optional[str]:
@@ -175,7 +244,7 @@ def format_phone_number(phone: Optional[str]) -> Optional[str]:
         return None
     
     # Удаляем все нецифровые символы кроме +
-    cleaned = ''.join(char for char in phone if char.isdigit() or char == '+')
+    cleaned = phone.translate(_PHONE_DEL_TABLE)
     
     if not cleaned:
         return None
@@ -194,13 +263,18 @@ class ModelConstraints:
     MAX_TITLE_LENGTH = 255
     MAX_URL_LENGTH = 500
     
-    # Статусы
-    CANDIDATE_STATUSES = ['active', 'inactive', 'pending', 'archived']
-    JOB_STATUSES = ['draft', 'published', 'closed', 'archived']
-    APPLICATION_STATUSES = ['applied', 'reviewed', 'interviewed', 'offered', 'hired', 'rejected']
+    # Статусы (кортежи - для CheckConstraint, frozenset - для проверок принадлежности)
+    CANDIDATE_STATUSES = ('active', 'inactive', 'pending', 'archived')
+    CANDIDATE_STATUSES_SET = frozenset(CANDIDATE_STATUSES)
+    JOB_STATUSES = ('draft', 'published', 'closed', 'archived')
+    JOB_STATUSES_SET = frozenset(JOB_STATUSES)
+    APPLICATION_STATUSES = ('applied', 'reviewed', 'interviewed', 'offered', 'hired', 'rejected')
+    APPLICATION_STATUSES_SET = frozenset(APPLICATION_STATUSES)
     
     # Уровни опыта
-    EXPERIENCE_LEVELS = ['entry', 'junior', 'middle', 'senior', 'lead', 'executive']
+    EXPERIENCE_LEVELS = ('entry', 'junior', 'middle', 'senior', 'lead', 'executive')
+    EXPERIENCE_LEVELS_SET = frozenset(EXPERIENCE_LEVELS)
     
     # Типы занятости
-    EMPLOYMENT_TYPES = ['full_time', 'part_time', 'contract', 'freelance', 'internship']
+    EMPLOYMENT_TYPES = ('full_time', 'part_time', 'contract', 'freelance', 'internship')
+    EMPLOYMENT_TYPES_SET = frozenset(EMPLOYMENT_TYPES)
@@ -8,39 +8,141 @@ import sys
 import os
 import asyncio
 import time
-import json
-from typing import Dict, Any, List
+import importlib
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Добавляем путь к проекту
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Импорты проверяем с обработкой ошибок
-try:
-    from deployment.common.utils.embedding_quality_test import check_embedding_quality
-except ImportError as e:
-    print(f"⚠️ Не удалось импортировать embedding_quality_test: {e}")
-    check_embedding_quality = None
 
-try:
-    from deployment.common.utils.worker_monitor import WorkerHealthMonitor
-except ImportError as e:
-    print(f"⚠️ Не удалось импортировать worker_monitor: {e}")
-    WorkerHealthMonitor = None
+@lru_cache(maxsize=None)
+def _load(module_name: str, attr: str):
+    """
+    Ленивый импорт вспомогательных подсистем
+    
+    Модуль загружается при первом обращении из проверки, которой он нужен;
+    при ошибке импорта возвращается None, а предупреждение выводится один раз.
+    """
+    try:
+        return getattr(importlib.import_module(f'deployment.common.utils.{module_name}'), attr)
+    except (ImportError, AttributeError) as e:
+        print(f"⚠️ Не удалось импортировать {module_name}: {e}")
+        return None
 
-try:
-    from deployment.common.utils.secret_manager import secret_manager, get_secret
-except ImportError as e:
-    print(f"⚠️ Не удалось импортировать secret_manager: {e}")
-    secret_manager = None
-    get_secret = lambda key, default=None: os.getenv(key, default)
+
+def get_secret(key: str, default=None):
+    """Чтение секрета через secret_manager с откатом на переменные окружения"""
+    loaded = _load('secret_manager', 'get_secret')
+    if loaded is None:
+        return os.getenv(key, default)
+    return loaded(key, default)
+
+
+# Ограничения времени выполнения отдельных проверок (секунды)
+CHECK_TIMEOUTS = {
+    'secrets': 2,
+    'database': 5,
+    'redis': 2,
+    'workers': 5,
+    'gpu_quality': 125,
+    'queues': 5,
+    'disk_space': 3,
+    'memory': 1,
+    'services': 6,
+}
+DEFAULT_CHECK_TIMEOUT = 10
+
+# Результат проверки качества GPU эмбеддингов дорогой, поэтому кэшируется дольше
+GPU_QUALITY_CACHE_TTL = 300.0
+
+# Иконка и описание для каждого общего статуса
+STATUS_TABLE = {
+    'healthy': ('✅', 'Система полностью готова'),
+    'mostly_healthy': ('🟢', 'Система готова с незначительными замечаниями'),
+    'warning': ('⚠️', 'Система частично готова, есть проблемы'),
+    'critical': ('❌', 'Система не готова, критические ошибки'),
+}
+UNKNOWN_STATUS = ('❓', 'Неопределенный статус')
+
+# Постоянный ключ для тестовой записи в Redis
+REDIS_PROBE_KEY = b'health_check:probe'
+
+# Пул соединений Redis переиспользуется между проверками
+_redis_pool = None
+
+
+def _get_redis_pool():
+    """Ленивое создание общего пула соединений Redis"""
+    global _redis_pool
+    if _redis_pool is None:
+        import redis
+        
+        redis_url = get_secret('REDIS_URL', 'redis://localhost:6379/0')
+        _redis_pool = redis.ConnectionPool.from_url(
+            redis_url,
+            max_connections=8,
+            socket_timeout=2,
+            socket_keepalive=True
+        )
+    return _redis_pool
+
+
+@lru_cache(maxsize=1)
+def _get_monitor():
+    """Общий экземпляр WorkerHealthMonitor для проверок воркеров и очередей"""
+    return _load('worker_monitor', 'WorkerHealthMonitor')()
+
+
+@lru_cache(maxsize=1)
+def _get_db_engine():
+    """
+    Общий engine для проверки базы данных
+    
+    Использует собственный маленький пул, чтобы исчерпанный пул приложения
+    не приводил к ложным сообщениям о недоступности БД.
+    """
+    from sqlalchemy import create_engine
+    from database.config import DatabaseConfig
+    
+    config = DatabaseConfig()
+    return create_engine(
+        config.DATABASE_URL,
+        pool_size=2,
+        max_overflow=0,
+        pool_recycle=config.POOL_RECYCLE,
+        connect_args=config.ssl_config or {}
+    )
 
 
 class HealthChecker:
     """Класс для проверки здоровья системы"""
     
+    # Время жизни закэшированных результатов проверки (секунды)
+    CACHE_TTL = 1.0
+    
+    _cached_results = None
+    _cache_ts = 0.0
+    
+    # (время, результат) последней проверки качества GPU, общий для всех экземпляров
+    _gpu_quality_cache = None
+    
     def __init__(self):
-        self.results = {
+        self.results = self._new_results()
+        self._inspection = None
+        # Одновременные вызовы ждут уже идущую проверку, а не запускают свою
+        self._run_lock = asyncio.Lock()
+    
+    @staticmethod
+    def _new_results() -> Dict[str, Any]:
+        """Пустая структура результатов проверки"""
+        return {
             'timestamp': datetime.now().isoformat(),
             'overall_status': 'unknown',
             'checks': {},
@@ -52,8 +154,42 @@ class HealthChecker:
             }
         }
     
-    async def run_all_checks(self) -> Dict[str, Any]:
+    def _cache_is_fresh(self) -> bool:
+        """Есть ли результаты моложе CACHE_TTL"""
+        return (
+            self._cached_results is not None
+            and time.monotonic() - self._cache_ts < self.CACHE_TTL
+        )
+    
+    def get_health_status(self) -> Dict[str, Any]:
+        """Последние результаты проверки без повторного выполнения"""
+        return self._cached_results if self._cached_results is not None else self.results
+    
+    async def run_all_checks(self, use_cache: bool = True) -> Dict[str, Any]:
         """Выполнение всех проверок здоровья системы"""
+        if use_cache and self._cache_is_fresh():
+            return self._cached_results
+        
+        async with self._run_lock:
+            # Пока ждали блокировку, результаты мог получить другой вызов
+            if use_cache and self._cache_is_fresh():
+                return self._cached_results
+            
+            results = await self._execute_checks()
+            self._cached_results = results
+            self._cache_ts = time.monotonic()
+            return results
+    
+    async def _execute_checks(self) -> Dict[str, Any]:
+        """
+        Запуск всех проверок и подсчет итогов
+        
+        Каждый запуск заполняет новую структуру и публикует ее в self.results
+        только целиком: ранее возвращенные результаты не меняются, а
+        get_health_status не видит частично заполненных данных.
+        """
+        run_results = self._new_results()
+        self._inspection = None
         checks = [
             ('secrets', self.check_secrets),
             ('database', self.check_database),
@@ -69,67 +205,78 @@ class HealthChecker:
         print("🔍 Запуск проверки готовности системы...")
         print("=" * 50)
         
-        for check_name, check_func in checks:
-            try:
-                print(f"🔍 Проверка {check_name}...", end=' ')
-                result = await check_func()
-                self.results['checks'][check_name] = result
-                self.results['summary']['total'] += 1
-                
-                status = result.get('status', 'unknown')
-                if status == 'ok':
-                    print("✅ OK")
-                    self.results['summary']['passed'] += 1
-                elif status == 'warning':
-                    print("⚠️ WARNING")
-                    self.results['summary']['warnings'] += 1
-                elif status == 'skip':
-                    print("⏭️ SKIP")
-                else:
-                    print("❌ FAILED")
-                    self.results['summary']['failed'] += 1
-                
-                if result.get('message'):
-                    print(f"   💬 {result['message']}")
-                    
-            except Exception as e:
-                print(f"❌ ERROR")
-                print(f"   💬 {str(e)}")
-                self.results['checks'][check_name] = {
-                    'status': 'error',
-                    'message': str(e)
-                }
-                self.results['summary']['total'] += 1
-                self.results['summary']['failed'] += 1
+        # Проверки независимы и в основном ждут I/O - запускаем их параллельно,
+        # результаты выводим в исходном порядке
+        results = await asyncio.gather(
+            *[self._run_one(check_name, check_func) for check_name, check_func in checks]
+        )
+        
+        summary = run_results['summary']
+        checks_out = run_results['checks']
+        for check_name, result in results:
+            print(f"🔍 Проверка {check_name}...", end=' ')
+            checks_out[check_name] = result
+            summary['total'] += 1
+            
+            status = result.get('status', 'unknown')
+            if status == 'ok':
+                print("✅ OK")
+                summary['passed'] += 1
+            elif status == 'warning':
+                print("⚠️ WARNING")
+                summary['warnings'] += 1
+            elif status == 'skip':
+                print("⏭️ SKIP")
+            else:
+                print("❌ FAILED")
+                summary['failed'] += 1
+            
+            if result.get('message'):
+                print(f"   💬 {result['message']}")
         
         # Определяем общий статус
-        self._determine_overall_status()
+        self._determine_overall_status(run_results)
         
         print("=" * 50)
-        self._print_summary()
+        self._print_summary(run_results)
         
-        return self.results
+        self.results = run_results
+        return run_results
+    
+    async def _run_one(self, check_name: str, check_func) -> Tuple[str, Dict[str, Any]]:
+        """Выполнение одной проверки с ограничением по времени и перехватом исключений"""
+        timeout = CHECK_TIMEOUTS.get(check_name, DEFAULT_CHECK_TIMEOUT)
+        try:
+            return check_name, await asyncio.wait_for(check_func(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return check_name, {'status': 'error', 'message': f'Превышено время ожидания ({timeout} с)'}
+        except Exception as e:
+            return check_name, {'status': 'error', 'message': str(e)}
     
-    def _determine_overall_status(self):
+    def _determine_overall_status(self, results: Dict[str, Any]):
         """Определение общего статуса системы"""
-        total = self.results['summary']['total']
-        passed = self.results['summary']['passed']
-        warnings = self.results['summary']['warnings']
-        failed = self.results['summary']['failed']
+        total = results['summary']['total']
+        warnings = results['summary']['warnings']
+        failed = results['summary']['failed']
         
-        if failed == 0 and warnings == 0:
-            self.results['overall_status'] = 'healthy'
-        elif failed == 0 and warnings <= total * 0.2:
-            self.results['overall_status'] = 'mostly_healthy'
-        elif failed <= total * 0.2:
-            self.results['overall_status'] = 'warning'
+        # Сравнение в целых числах: warnings * 5 <= total эквивалентно доле <= 20%
+        if total == 0:
+            status = 'unknown'
+        elif failed == 0 and warnings == 0:
+            status = 'healthy'
+        elif failed == 0 and warnings * 5 <= total:
+            status = 'mostly_healthy'
+        elif failed * 5 <= total:
+            status = 'warning'
         else:
-            self.results['overall_status'] = 'critical'
+            status = 'critical'
+        
+        results['overall_status'] = status
     
-    def _print_summary(self):
+    def _print_summary(self, results: Dict[str, Any]):
         """Вывод сводки результатов"""
-        summary = self.results['summary']
-        status = self.results['overall_status']
+        summary = results['summary']
+        status = results['overall_status']
         
         print(f"📊 СВОДКА ПРОВЕРКИ:")
         print(f"   Всего проверок: {summary['total']}")
@@ -138,22 +285,7 @@ class HealthChecker:
         print(f"   Ошибки: {summary['failed']}")
         print()
         
-        status_icons = {
-            'healthy': '✅',
-            'mostly_healthy': '🟢',
-            'warning': '⚠️',
-            'critical': '❌'
-        }
-        
-        status_messages = {
-            'healthy': 'Система полностью готова',
-            'mostly_healthy': 'Система готова с незначительными замечаниями',
-            'warning': 'Система частично готова, есть проблемы',
-            'critical': 'Система не готова, критические ошибки'
-        }
-        
-        icon = status_icons.get(status, '❓')
-        message = status_messages.get(status, 'Неопределенный статус')
+        icon, message = STATUS_TABLE.get(status, UNKNOWN_STATUS)
         
         print(f"{icon} ОБЩИЙ СТАТУС: {status.upper()}")
         print(f"   {message}")
@@ -161,6 +293,7 @@ class HealthChecker:
     async def check_secrets(self) -> Dict[str, Any]:
         """Проверка доступности секретов"""
         try:
+            secret_manager = _load('secret_manager', 'secret_manager')
             if secret_manager is None:
                 return {
                     'status': 'warning',
@@ -183,21 +316,14 @@ class HealthChecker:
     async def check_database(self) -> Dict[str, Any]:
         """Проверка подключения к базе данных"""
         try:
-            from database.config import Database
-            db = Database()
-            
-            with db.engine.connect() as conn:
-                result = conn.execute("SELECT 1").fetchone()
-                if result and result[0] == 1:
-                    # Дополнительные проверки
-                    version_result = conn.execute("SELECT version()").fetchone()
-                    version = version_result[0] if version_result else 'unknown'
-                    
-                    return {
-                        'status': 'ok',
-                        'message': 'База данных доступна',
-                        'details': {'version': version[:50] + '...'}
-                    }
+            row = await asyncio.to_thread(self._query_database)
+            if row[0] == 1:
+                version = row[1] or 'unknown'
+                return {
+                    'status': 'ok',
+                    'message': 'База данных доступна',
+                    'details': {'version': version[:50] + '...'}
+                }
             
             return {
                 'status': 'error',
@@ -206,23 +332,32 @@ class HealthChecker:
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
     
+    @staticmethod
+    def _query_database():
+        """Тестовый запрос и версия сервера за один round trip, без BEGIN/COMMIT"""
+        from sqlalchemy import text
+        
+        with _get_db_engine().connect() as conn:
+            conn = conn.execution_options(isolation_level='AUTOCOMMIT')
+            return conn.execute(text("SELECT 1, version()")).one()
+    
     async def check_redis(self) -> Dict[str, Any]:
         """Проверка подключения к Redis"""
         try:
             import redis
             
-            redis_url = get_secret('REDIS_URL', 'redis://localhost:6379/0')
-            r = redis.from_url(redis_url)
+            r = redis.Redis(connection_pool=_get_redis_pool())
             
-            # Тестовые операции
-            r.ping()
-            test_key = f'health_check_{int(time.time())}'
-            r.set(test_key, 'ok', ex=10)
-            value = r.get(test_key)
-            r.delete(test_key)
+            # Все тестовые операции - одним запросом, в отдельном потоке
+            with r.pipeline(transaction=False) as pipe:
+                pipe.ping()
+                pipe.set(REDIS_PROBE_KEY, b'ok', px=10000)
+                pipe.get(REDIS_PROBE_KEY)
+                pipe.delete(REDIS_PROBE_KEY)
+                pipe.info()
+                _, _, value, _, info = await asyncio.to_thread(pipe.execute)
             
             if value == b'ok':
-                info = r.info()
                 return {
                     'status': 'ok',
                     'message': 'Redis доступен',
@@ -242,14 +377,13 @@ class HealthChecker:
     async def check_workers(self) -> Dict[str, Any]:
         """Проверка состояния Celery воркеров"""
         try:
-            if WorkerHealthMonitor is None:
+            if _load('worker_monitor', 'WorkerHealthMonitor') is None:
                 return {
                     'status': 'warning',
                     'message': 'Мониторинг воркеров недоступен'
                 }
             
-            monitor = WorkerHealthMonitor()
-            workers = await monitor.check_workers_health()
+            workers, _ = await self._inspect_once()
             
             if not workers:
                 return {
@@ -281,6 +415,22 @@ class HealthChecker:
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
     
+    async def _inspect_once(self) -> Tuple[list, list]:
+        """
+        Состояние воркеров и очередей, запрашиваемое один раз за проверку
+        
+        check_workers и check_queues ждут одну и ту же задачу; shield не дает
+        таймауту одной проверки отменить общий запрос для другой.
+        """
+        if self._inspection is None:
+            monitor = _get_monitor()
+            self._inspection = asyncio.ensure_future(asyncio.gather(
+                monitor.check_workers_health(),
+                monitor.check_queues_health()
+            ))
+        workers, queues = await asyncio.shield(self._inspection)
+        return workers, queues
+    
     async def check_gpu_quality(self) -> Dict[str, Any]:
         """Проверка качества GPU эмбеддингов"""
         try:
@@ -290,47 +440,69 @@ class HealthChecker:
                     'message': 'GPU не настроен'
                 }
             
+            cached = HealthChecker._gpu_quality_cache
+            if cached is not None and time.monotonic() - cached[0] < GPU_QUALITY_CACHE_TTL:
+                verdict = dict(cached[1])
+                verdict['details'] = {**verdict.get('details', {}), 'cached': True}
+                return verdict
+            
+            # Быстрая предварительная проверка: без библиотек модели полный тест
+            # все равно упадет, но только после долгой попытки инициализации
+            from importlib.util import find_spec
+            missing = [name for name in ('torch', 'sentence_transformers') if find_spec(name) is None]
+            if missing:
+                return {
+                    'status': 'error',
+                    'message': f'Библиотеки модели эмбеддингов не установлены: {", ".join(missing)}'
+                }
+            
+            check_embedding_quality = _load('embedding_quality_test', 'check_embedding_quality')
             if check_embedding_quality is None:
                 return {
                     'status': 'warning',
                     'message': 'Модуль проверки GPU недоступен'
                 }
             
-            result = check_embedding_quality(timeout=120)
-            
-            if result['success']:
-                quality_score = result['metrics'].get('quality_score', 0)
-                if quality_score > 0.7:
-                    return {
-                        'status': 'ok',
-                        'message': f'Качество GPU эмбеддингов хорошее ({quality_score:.2f})',
-                        'details': result['metrics']
-                    }
-                else:
-                    return {
-                        'status': 'warning',
-                        'message': f'Качество GPU эмбеддингов среднее ({quality_score:.2f})',
-                        'details': result['metrics']
-                    }
+            result = await asyncio.to_thread(check_embedding_quality, timeout=120)
+            verdict = self._gpu_quality_verdict(result)
+            HealthChecker._gpu_quality_cache = (time.monotonic(), verdict)
+            return verdict
+        except Exception as e:
+            return {'status': 'error', 'message': str(e)}
+    
+    @staticmethod
+    def _gpu_quality_verdict(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Преобразование результата теста качества эмбеддингов в статус проверки"""
+        if result['success']:
+            quality_score = result['metrics'].get('quality_score', 0)
+            if quality_score > 0.7:
+                return {
+                    'status': 'ok',
+                    'message': f'Качество GPU эмбеддингов хорошее ({quality_score:.2f})',
+                    'details': result['metrics']
+                }
             else:
                 return {
-                    'status': 'error',
-                    'message': f'Ошибка тестирования GPU: {result["error"]}'
+                    'status': 'warning',
+                    'message': f'Качество GPU эмбеддингов среднее ({quality_score:.2f})',
+                    'details': result['metrics']
                 }
-        except Exception as e:
-            return {'status': 'error', 'message': str(e)}
+        else:
+            return {
+                'status': 'error',
+                'message': f'Ошибка тестирования GPU: {result["error"]}'
+            }
     
     async def check_queues(self) -> Dict[str, Any]:
         """Проверка состояния очередей"""
         try:
-            if WorkerHealthMonitor is None:
+            if _load('worker_monitor', 'WorkerHealthMonitor') is None:
                 return {
                     'status': 'warning',
                     'message': 'Мониторинг очередей недоступен'
                 }
             
-            monitor = WorkerHealthMonitor()
-            queues = await monitor.check_queues_health()
+            _, queues = await self._inspect_once()
             
             if not queues:
                 return {
@@ -381,15 +553,23 @@ class HealthChecker:
             warnings = []
             critical = []
             
-            for path in paths_to_check:
-                if os.path.exists(path):
-                    total, used, free = shutil.disk_usage(path)
-                    free_percent = (free / total) * 100
-                    
-                    if free_percent < 5:
-                        critical.append(f"{path}: {free_percent:.1f}% свободно")
-                    elif free_percent < 15:
-                        warnings.append(f"{path}: {free_percent:.1f}% свободно")
+            async def disk_usage(path: str):
+                # Отсутствующий путь ловим по исключению, без отдельного os.path.exists
+                try:
+                    return path, await asyncio.to_thread(shutil.disk_usage, path)
+                except FileNotFoundError:
+                    return path, None
+            
+            usages = await asyncio.gather(*[disk_usage(path) for path in paths_to_check])
+            
+            for path, usage in usages:
+                if usage is None:
+                    continue
+                
+                free_percent = usage.free * 100 / usage.total
+                if free_percent < 15:
+                    entry = f"{path}: {free_percent:.1f}% свободно"
+                    (critical if free_percent < 5 else warnings).append(entry)
             
             if critical:
                 return {
@@ -414,7 +594,7 @@ class HealthChecker:
         try:
             import psutil
             
-            memory = psutil.virtual_memory()
+            memory = await asyncio.to_thread(psutil.virtual_memory)
             memory_percent = memory.percent
             
             if memory_percent > 90:
@@ -447,8 +627,6 @@ class HealthChecker:
     async def check_systemd_services(self) -> Dict[str, Any]:
         """Проверка статуса systemd сервисов"""
         try:
-            import subprocess
-            
             services = [
                 'hr-celery-cpu',
                 'hr-worker-monitor',
@@ -460,28 +638,12 @@ class HealthChecker:
             if os.getenv('GPU_INSTANCE_NAME'):
                 services.extend(['hr-celery-gpu', 'hr-gpu-monitor'])
             
-            failed_services = []
-            inactive_services = []
-            active_services = []
+            # Один вызов systemctl на все сервисы, в отдельном потоке
+            states, error = await asyncio.to_thread(self._probe_services, services)
             
-            for service in services:
-                try:
-                    result = subprocess.run(
-                        ['systemctl', 'is-active', service],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    
-                    if result.returncode == 0 and result.stdout.strip() == 'active':
-                        active_services.append(service)
-                    else:
-                        inactive_services.append(service)
-                        
-                except subprocess.TimeoutExpired:
-                    failed_services.append(f"{service} (timeout)")
-                except Exception as e:
-                    failed_services.append(f"{service} ({str(e)})")
+            failed_services = [f"{service} ({error})" for service in services] if error else []
+            active_services = [service for service, state in states if state == 'active']
+            inactive_services = [service for service, state in states if state != 'active']
             
             if failed_services:
                 return {
@@ -502,6 +664,37 @@ class HealthChecker:
                 }
         except Exception as e:
             return {'status': 'error', 'message': str(e)}
+    
+    @staticmethod
+    def _probe_services(services: List[str]) -> Tuple[List[Tuple[str, str]], str]:
+        """
+        Синхронный опрос systemctl для всех сервисов одним процессом
+        
+        `systemctl is-active a b c` печатает по строке на каждый юнит в том же
+        порядке и возвращает ненулевой код, если хоть один неактивен, поэтому
+        код возврата не используется.
+        
+        Returns:
+            Кортеж ([(сервис, состояние)], ошибка)
+        """
+        import subprocess
+        
+        try:
+            result = subprocess.run(
+                ['systemctl', 'is-active', *services],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+        except subprocess.TimeoutExpired:
+            return [], 'timeout'
+        except Exception as e:
+            return [], str(e)
+        
+        lines = result.stdout.splitlines()
+        # Недостающие строки считаем неактивными сервисами
+        lines += ['unknown'] * (len(services) - len(lines))
+        return [(service, line.strip()) for service, line in zip(services, lines)], ''
 
 
 async def main():
@@ -511,8 +704,14 @@ async def main():
     
     # Сохраняем результаты в файл
     results_file = f"/tmp/health_check_{int(time.time())}.json"
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        with open(results_file, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        import json
+        
+        with open(results_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
     
     print(f"\n📄 Результаты сохранены в: {results_file}")
     
@@ -527,6 +726,12 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -63,7 +63,7 @@ fi
 log_message "✅ Виртуальное окружение активно: $VIRTUAL_ENV"
 
 # Настройка переменных окружения
-export PYTHONPATH="${PYTHONPATH}:$(pwd)"
+export PYTHONPATH="${PYTHONPATH}:$(pwd):$(dirname "$(pwd)")"
 export ENVIRONMENT="development"  # Используем development для тестирования
 log_message "🔧 Переменные окружения настроены"
 
@@ -110,21 +110,33 @@ check_worker_status() {
 }
 
 # Функция запуска воркера
+# Третий аргумент - пул исполнения (по умолчанию prefork). Для очередей, где задачи
+# в основном ждут сеть/БД, используется threads: слот не блокирует целый процесс
 start_worker() {
     local queue=$1
     local concurrency=$2
+    local pool=${3:-prefork}
     local worker_name="worker_${queue}"
     
+    # Для prefork задачи отдаются только свободным процессам (-O fair): длинная задача
+    # эмбеддингов не держит в очереди процесса следующие, пока другие простаивают
+    local optimization=""
+    if [ "$pool" = "prefork" ]; then
+        optimization="-O fair"
+    fi
+    
     # ИСПРАВЛЕНИЕ: Проверка существующего воркера
     if check_worker_status "$queue"; then
         log_message "⚠️ Воркер $queue уже запущен, пропускаем"
         return 0
     fi
     
-    log_message "🚀 Запуск воркера для очереди: ${queue} (concurrency: ${concurrency})"
+    log_message "🚀 Запуск воркера для очереди: ${queue} (concurrency: ${concurrency}, pool: ${pool})"
     
     celery -A celery_app.celery_app worker \
         --queues="${queue}" \
+        --pool="${pool}" \
+        ${optimization} \
         --concurrency="${concurrency}" \
         --hostname="${worker_name}@%h" \
         --loglevel=info \
@@ -232,7 +244,7 @@ case "$COMMAND" in
         echo "🚀 Запуск воркеров для ${SERVER_TYPE} сервера..."
         
         # Новая бизнес-архитектура очередей
-        start_worker "fillout_processing" 2      # Получение данных из внешних источников (Fillout API)
+        start_worker "fillout_processing" 8 threads  # Fillout API: I/O-bound, потоки в одном процессе (8 <= DB_POOL_SIZE + DB_MAX_OVERFLOW)
         start_worker "text_processing" 2         # Обработка и парсинг текстов (резюме, вакансии)
         start_worker "embeddings" 2              # Генерация эмбеддингов
         start_worker "reranking" 1               # AI-реранжирование результатов (concurrency=1 для избежания OOM)
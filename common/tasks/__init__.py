@@ -4,12 +4,19 @@ Tasks package for HR Analysis system (Deployment Version)
 Contains only essential Celery tasks for two main workflows:
 - workflows: Main processing chains
 - fillout_tasks: Data retrieval from Fillout API
+- parsing_tasks: Resume and job text parsing
 - embedding_tasks: Vector embeddings generation
 - reranking_tasks: Reranking resumes and jobs
+
+Task modules are registered by the Celery app via autodiscover_tasks, so
+importing this package does not load them. TASK_MODULES is the single
+list of modules the app registers.
 """
 
-# Import all task modules to ensure they are registered with Celery
-from . import workflows
-from . import fillout_tasks
-from . import embedding_tasks
-from . import reranking_tasks
+TASK_MODULES = (
+    'common.tasks.fillout_tasks',
+    'common.tasks.parsing_tasks',
+    'common.tasks.embedding_tasks',
+    'common.tasks.reranking_tasks',
+    'common.tasks.workflows',
+)
@@ -2,32 +2,379 @@
 Celery задачи для работы с эмбеддингами (очищенная версия)
 """
 
+import hashlib
 import os
-import sys
+import secrets
+import threading
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 import traceback
 
-from celery import current_task, shared_task
+import numpy as np
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
+
 from celery.utils.log import get_task_logger
+from sqlalchemy import String, and_, cast, exists
+from sqlalchemy.orm import selectinload, undefer_group
 
 # Абсолютные импорты для избежания проблем с путями
 from common.database.config import database
 from common.database.operations.embedding_operations import embedding_crud
-from common.database.operations.candidate_operations import SubmissionCRUD
-from common.database.operations.company_operations import JobCRUD
 from common.models.candidates import Submission
 from common.models.companies import Job
 from common.models.embeddings import EmbeddingMetadata
 from common.utils.chroma_config import chroma_client, ChromaConfig
-from common.utils.text_preprocessing import preprocess_resume_text, preprocess_job_description_text, preprocess_text_with_stats
+from common.utils.text_preprocessing import (
+    preprocess_resume_text, preprocess_job_description_text, preprocess_text_with_stats,
+    JOB_DESCRIPTION_PREPROCESSING_CONFIG
+)
 
 # Импортируем Celery app напрямую
 from common.celery_app.celery_app import celery_app
+from common.celery_app.redis_manager import get_cache_client, report_cache_error
 
 logger = get_task_logger(__name__)
 
+# Размер пакета документов для одного вызова collection.add в ChromaDB
+CHROMA_ADD_BATCH = int(os.getenv('CHROMA_ADD_BATCH', '128'))
+
+# Сколько пакетов collection.add может выполняться в ChromaDB одновременно
+CHROMA_ADD_CONCURRENCY = int(os.getenv('CHROMA_ADD_CONCURRENCY', '4'))
+
+# Прогресс в result backend пишется не чаще раза в PROGRESS_MIN_INTERVAL секунд,
+# кроме перехода через очередные PROGRESS_STEP процентов
+PROGRESS_MIN_INTERVAL = 1.0
+PROGRESS_STEP = 5
+
+# Предобработка в пуле процессов: число процессов и минимальный объем, с которого пул окупается
+PREPROC_WORKERS = int(os.getenv('PREPROC_WORKERS', str(os.cpu_count() or 1)))
+PREPROC_PARALLEL_MIN = int(os.getenv('PREPROC_PARALLEL_MIN', '64'))
+
+# Конфигурация предобработки вакансий в форме ключа _preprocess_cached, собирается один раз
+_JOB_PREPROC_CONFIG_ITEMS = tuple(sorted(JOB_DESCRIPTION_PREPROCESSING_CONFIG.items()))
+
+# Сколько результатов предобработки процесс держит в памяти (ключ - хэш текста и конфигурации)
+PREPROC_CACHE_SIZE = 4096
+
+# Время жизни эмбеддинга текста в Redis (секунды); ключ включает имя модели
+EMBEDDING_CACHE_TTL = int(os.getenv('EMBEDDING_CACHE_TTL', str(30 * 24 * 3600)))
+
+
+_preproc_results = OrderedDict()
+_preproc_lock = threading.Lock()
+
+
+def _preprocess_cached(raw_text: str, config_items: Optional[tuple] = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    preprocess_text_with_stats с LRU-кэшем процесса по хэшу содержимого
+    
+    Ключ - blake2b текста и конфигурация, поэтому в памяти остаются только
+    результаты предобработки, а не исходные тексты резюме.
+    
+    Args:
+        raw_text: Исходный текст
+        config_items: Конфигурация препроцессора в виде tuple(sorted(config.items()))
+    """
+    key = (hashlib.blake2b(raw_text.encode(), digest_size=16).digest(), config_items)
+    with _preproc_lock:
+        cached = _preproc_results.get(key)
+        if cached is not None:
+            _preproc_results.move_to_end(key)
+            return cached
+    
+    result = preprocess_text_with_stats(
+        raw_text, config=dict(config_items) if config_items else None
+    )
+    
+    with _preproc_lock:
+        _preproc_results[key] = result
+        if len(_preproc_results) > PREPROC_CACHE_SIZE:
+            _preproc_results.popitem(last=False)
+    return result
+
+
+def _preprocess_all(raw_texts: List[str], config_items: Optional[tuple] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Предобработка всех текстов задачи с сохранением порядка
+    
+    Предобработка - чистый Python (regex, unicode), поэтому при большом объеме
+    тексты распределяются по ProcessPoolExecutor. Если пул недоступен (например,
+    дочерний процесс prefork-воркера не может порождать процессы), обработка
+    выполняется последовательно. Повторяющиеся тексты обрабатываются один раз:
+    в процессы пула не передаются копии и кэш родителя для них не нужен.
+    """
+    unique_texts = list(dict.fromkeys(raw_texts))
+    results = None
+    
+    if PREPROC_WORKERS > 1 and len(unique_texts) >= PREPROC_PARALLEL_MIN:
+        try:
+            with ProcessPoolExecutor(max_workers=PREPROC_WORKERS) as executor:
+                results = list(executor.map(
+                    _preprocess_cached, unique_texts, repeat(config_items),
+                    chunksize=max(1, len(unique_texts) // (PREPROC_WORKERS * 4))
+                ))
+        except Exception as e:
+            logger.warning(f"⚠️ Пул процессов предобработки недоступен, обработка последовательная: {e}")
+    
+    if results is None:
+        results = [_preprocess_cached(raw_text, config_items) for raw_text in unique_texts]
+    
+    if len(unique_texts) == len(raw_texts):
+        return results
+    by_text = dict(zip(unique_texts, results))
+    return [by_text[raw_text] for raw_text in raw_texts]
+
+
+def _has_embedding(source_type: str, source_id_column):
+    """EXISTS-условие наличия эмбеддинга источника (использует idx_embedding_source)"""
+    return exists().where(and_(
+        EmbeddingMetadata.source_type == source_type,
+        EmbeddingMetadata.source_id == cast(source_id_column, String)
+    ))
+
+
+def _similar_above_threshold(distances: List[float], min_similarity: float) -> List[Tuple[int, float]]:
+    """
+    Индексы и схожесть результатов поиска не ниже порога
+    
+    ChromaDB возвращает расстояние, а не схожесть: перевод 1 - distance
+    и фильтрация выполняются одной векторной операцией NumPy.
+    """
+    similarities = 1.0 - np.asarray(distances, dtype=np.float64)
+    indices = np.flatnonzero(similarities >= min_similarity)
+    return list(zip(indices.tolist(), similarities[indices].tolist()))
+
+
+def _throttled_progress(task, total: int, label: str) -> Callable[[int], None]:
+    """
+    Функция обновления прогресса задачи с ограничением частоты
+    
+    Каждый update_state - запись в result backend, поэтому состояние
+    обновляется не чаще PROGRESS_MIN_INTERVAL секунд или при переходе
+    через очередные PROGRESS_STEP процентов.
+    """
+    last_update = 0.0
+    last_step = -1
+    
+    def report(position: int) -> None:
+        nonlocal last_update, last_step
+        progress = int(10 + (position / total) * 80)
+        step = progress // PROGRESS_STEP
+        now = time.monotonic()
+        if step == last_step and now - last_update < PROGRESS_MIN_INTERVAL:
+            return
+        last_update, last_step = now, step
+        task.update_state(
+            state='PROGRESS',
+            meta={
+                'progress': progress,
+                'status': f'Обработка {label} {position}/{total}'
+            }
+        )
+    
+    return report
+
+
+def _duplicate_texts(preprocessed: List[Tuple[str, Dict[str, Any]]]) -> frozenset:
+    """Обработанные тексты, встречающиеся в запуске больше одного раза"""
+    counts = Counter(processed_text for processed_text, _ in preprocessed)
+    duplicates = frozenset(text for text, count in counts.items() if count > 1)
+    if duplicates:
+        logger.info(f"♻️ Повторяющихся текстов в запуске: {len(duplicates)}, эмбеддинг для них считается один раз")
+    return duplicates
+
+
+def _embedding_cache_key(text: str) -> str:
+    """Ключ эмбеддинга текста в Redis: emb:{модель}:{blake2b текста}"""
+    text_digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+    return f"emb:{ChromaConfig.EMBEDDING_MODEL}:{text_digest}"
+
+
+def _load_cached_embeddings(texts: List[str]) -> Dict[str, Any]:
+    """Эмбеддинги текстов из Redis одним MGET; отсутствующие в кэше тексты не попадают в результат"""
+    cache = get_cache_client()
+    if cache is None or not texts:
+        return {}
+    try:
+        values = cache.mget([_embedding_cache_key(text) for text in texts])
+    except Exception as e:
+        report_cache_error(e)
+        logger.warning(f"⚠️ Ошибка чтения кэша эмбеддингов: {e}")
+        return {}
+    return {
+        text: np.frombuffer(value, dtype=np.float32)
+        for text, value in zip(texts, values)
+        if value is not None
+    }
+
+
+def _store_cached_embeddings(embeddings: Dict[str, Any]) -> None:
+    """Запись эмбеддингов в Redis (float32) одним pipeline"""
+    cache = get_cache_client()
+    if cache is None or not embeddings:
+        return
+    try:
+        pipe = cache.pipeline(transaction=False)
+        for text, embedding in embeddings.items():
+            pipe.setex(
+                _embedding_cache_key(text),
+                EMBEDDING_CACHE_TTL,
+                np.asarray(embedding, dtype=np.float32).tobytes()
+            )
+        pipe.execute()
+    except Exception as e:
+        report_cache_error(e)
+        logger.warning(f"⚠️ Ошибка записи кэша эмбеддингов: {e}")
+
+
+def _save_batch_metadata(db, collection, batch: List[Dict[str, Any]]) -> int:
+    """
+    Сохранение метаданных пакета, уже добавленного в ChromaDB,
+    в PostgreSQL одним upsert и одним commit
+    
+    Предыдущие документы пересоздаваемых источников удаляются из ChromaDB
+    одним collection.delete на пакет, а не остаются в коллекции сиротами.
+    
+    Args:
+        batch: Параметры create_embedding_metadata для каждого документа
+        
+    Returns:
+        Количество записанных документов
+    """
+    if not batch:
+        return 0
+    
+    previous_ids = embedding_crud.get_chroma_ids_by_sources(
+        db, batch[0]['source_type'], [item['source_id'] for item in batch]
+    )
+    
+    written = embedding_crud.bulk_create_embedding_metadata(db, batch)
+    
+    if previous_ids:
+        try:
+            collection.delete(ids=list(previous_ids.values()))
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось удалить {len(previous_ids)} устаревших документов из ChromaDB: {e}")
+    
+    return written
+
+
+def _chroma_add_batch_size() -> int:
+    """Размер пакета collection.add с учетом ограничения клиента ChromaDB"""
+    try:
+        return max(1, min(CHROMA_ADD_BATCH, chroma_client.client.get_max_batch_size()))
+    except Exception:
+        return max(1, CHROMA_ADD_BATCH)
+
+
+class _ChromaBatchWriter:
+    """
+    Пакетная запись документов в ChromaDB и PostgreSQL
+    
+    Документы копятся в пакеты по CHROMA_ADD_BATCH (но не больше максимального
+    размера пакета клиента ChromaDB). collection.add пакетов
+    выполняются в потоках (до CHROMA_ADD_CONCURRENCY одновременно), поэтому
+    запись в ChromaDB (включая расчет эмбеддингов) перекрывается с подготовкой
+    следующих пакетов. Метаданные пишутся в потоке задачи в порядке пакетов,
+    по мере завершения их collection.add: сессия БД в потоки не передается.
+    
+    Эмбеддинги вычисляются явно и передаются в collection.add. Сначала они
+    ищутся в Redis по хэшу текста (повторные запуски не пересчитывают
+    неизменившиеся тексты), остальные считаются одним запросом к Ollama на пакет.
+    Тексты из duplicate_texts (встречающиеся в запуске несколько раз) кроме того
+    держатся в памяти до конца запуска. Документы в ChromaDB остаются отдельными
+    для каждого источника (chroma_document_id уникален в embedding_metadata).
+    """
+    
+    def __init__(self, db, collection, label: str, on_progress=None, duplicate_texts=frozenset()):
+        self.db = db
+        self.collection = collection
+        self.label = label
+        self.on_progress = on_progress
+        self.duplicate_texts = duplicate_texts
+        self._shared_embeddings: Dict[str, Any] = {}
+        self.batch_size = _chroma_add_batch_size()
+        self.processed = 0
+        self.failed = 0
+        self.done = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._inflight = deque()
+        self._executor = ThreadPoolExecutor(
+            max_workers=CHROMA_ADD_CONCURRENCY, thread_name_prefix='chroma-add'
+        )
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._submit()
+                while self._inflight:
+                    self._drain_one()
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+        return False
+    
+    def add(self, item: Dict[str, Any]) -> None:
+        """Добавление документа (параметры create_embedding_metadata) в текущий пакет"""
+        self._pending.append(item)
+        if len(self._pending) >= self.batch_size:
+            self._submit()
+    
+    def _submit(self) -> None:
+        """Отправка накопленного пакета в ChromaDB в фоновом потоке"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        future = self._executor.submit(self._add_batch, batch)
+        self._inflight.append((future, batch))
+        while len(self._inflight) > CHROMA_ADD_CONCURRENCY:
+            self._drain_one()
+    
+    def _add_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """collection.add пакета (выполняется в потоке пула)"""
+        documents = [item['text_content'] for item in batch]
+        # Пакет эмбеддингов передается одной матрицей float32 (без поэлементного приведения списков)
+        self.collection.add(
+            documents=documents,
+            embeddings=np.asarray(self._embed(documents), dtype=np.float32),
+            metadatas=[item['additional_metadata'] for item in batch],
+            ids=[item['chroma_document_id'] for item in batch]
+        )
+    
+    def _embed(self, documents: List[str]) -> List[Any]:
+        """Эмбеддинги пакета: из памяти запуска, из Redis, остальные - одним запросом к Ollama"""
+        shared = self._shared_embeddings
+        unique = [text for text in dict.fromkeys(documents) if text not in shared]
+        found = _load_cached_embeddings(unique)
+        missing = [text for text in unique if text not in found]
+        computed = dict(zip(missing, chroma_client.create_embeddings(missing)))
+        _store_cached_embeddings(computed)
+        found.update(computed)
+        for text in self.duplicate_texts.intersection(found):
+            shared[text] = found[text]
+        return [found[text] if text in found else shared[text] for text in documents]
+    
+    def _drain_one(self) -> None:
+        """Ожидание самого старого пакета и запись его метаданных"""
+        future, batch = self._inflight.popleft()
+        try:
+            future.result()
+            self.processed += _save_batch_metadata(self.db, self.collection, batch)
+            logger.info(f"✅ Записан пакет из {len(batch)} {self.label}")
+        except Exception as e:
+            self.db.rollback()
+            self.failed += len(batch)
+            logger.error(f"❌ Ошибка записи пакета из {len(batch)} {self.label}: {str(e)}")
+        self.done += len(batch)
+        if self.on_progress is not None:
+            self.on_progress(self.done)
+
 
 @celery_app.task(bind=True, name='common.tasks.embedding_tasks.generate_resume_embeddings')
 def generate_resume_embeddings(self, submission_ids: Optional[List[str]] = None):
@@ -44,6 +391,9 @@ def generate_resume_embeddings(self, submission_ids: Optional[List[str]] = None)
         submission_ids = None
     
     db = database.get_session()
+    # Загруженные строки только читаются, а метаданные фиксируются пакетами: без
+    # expire_on_commit commit пакета не заставляет перечитывать оставшиеся строки по одной
+    db.expire_on_commit = False
     try:
         # Обновляем прогресс
         self.update_state(state='PROGRESS', meta={'progress': 5, 'status': 'Инициализация'})
@@ -61,29 +411,33 @@ def generate_resume_embeddings(self, submission_ids: Optional[List[str]] = None)
         
         # Получаем заявки для обработки
         if submission_ids:
-            submissions = []
+            submission_uuids = []
             for submission_id in submission_ids:
                 try:
-                    submission_uuid = uuid.UUID(submission_id)
-                    submission = SubmissionCRUD().get_by_id(db, submission_uuid)
-                    if submission and getattr(submission, 'resume_raw_text', None):
-                        submissions.append(submission)
+                    submission_uuids.append(uuid.UUID(submission_id))
                 except ValueError:
                     logger.warning(f"Неверный формат UUID для заявки: {submission_id}")
                     continue
-        else:
-            # Получаем все заявки с сырым текстом, которые еще не обработаны
-            all_submissions = db.query(Submission).filter(
+            
+            # Все заявки одним запросом IN (...) вместо get_by_id на каждый ID,
+            # кандидаты подгружаются сразу, без ленивого SELECT на каждую заявку
+            submissions = db.query(Submission).options(
+                selectinload(Submission.candidate)
+            ).filter(
+                Submission.submission_id.in_(submission_uuids),
                 Submission.resume_raw_text.isnot(None),
                 Submission.resume_raw_text != ''
+            ).all() if submission_uuids else []
+        else:
+            # Получаем заявки с сырым текстом, для которых еще нет эмбеддингов: отбор
+            # выполняется в SQL (NOT EXISTS), уже обработанные строки не загружаются
+            submissions = db.query(Submission).options(
+                selectinload(Submission.candidate)
+            ).filter(
+                Submission.resume_raw_text.isnot(None),
+                Submission.resume_raw_text != '',
+                ~_has_embedding('resume', Submission.submission_id)
             ).all()
-            
-            # Фильтруем те, для которых еще нет эмбеддингов
-            submission_string_ids = [str(sub.submission_id) for sub in all_submissions]
-            unprocessed_ids = embedding_crud.get_sources_without_embeddings(
-                db, 'resume', submission_string_ids
-            )
-            submissions = [sub for sub in all_submissions if str(sub.submission_id) in unprocessed_ids]
         
         if not submissions:
             logger.info("✅ Нет новых резюме для обработки")
@@ -95,95 +449,74 @@ def generate_resume_embeddings(self, submission_ids: Optional[List[str]] = None)
         
         logger.info(f"📊 Найдено {len(submissions)} резюме для обработки")
         
-        processed_count = 0
+        # Предобработка всех резюме до цикла (используем конфигурацию по умолчанию для резюме)
+        preprocessed = _preprocess_all(
+            [getattr(submission, 'resume_raw_text', '') or '' for submission in submissions]
+        )
+        
         failed_count = 0
         
-        for i, submission in enumerate(submissions):
-            try:
-                # Обновляем прогресс
-                progress = 10 + (i / len(submissions)) * 80
-                self.update_state(
-                    state='PROGRESS', 
-                    meta={
-                        'progress': int(progress),
-                        'status': f'Обработка резюме {i+1}/{len(submissions)}',
-                        'current_submission_id': str(submission.submission_id)
+        writer = _ChromaBatchWriter(
+            db, collection, 'резюме',
+            on_progress=_throttled_progress(self, len(submissions), 'резюме'),
+            duplicate_texts=_duplicate_texts(preprocessed)
+        )
+        # Время создания одно на весь запуск, а не вычисляется для каждого документа
+        created_at = datetime.now().isoformat()
+        with writer:
+            for i, submission in enumerate(submissions):
+                try:
+                    # Генерируем уникальный ID для документа в ChromaDB
+                    chroma_doc_id = f"resume_{submission.submission_id}_{secrets.token_hex(4)}"
+                    
+                    # Предобработанный текст резюме
+                    processed_text, preprocessing_stats = preprocessed[i]
+                    
+                    # Логируем статистику предобработки
+                    logger.info(f"📝 Предобработка резюме {submission.submission_id}: "
+                              f"было {preprocessing_stats['original_length']} символов, "
+                              f"стало {preprocessing_stats['processed_length']} символов "
+                              f"(сжатие: {preprocessing_stats['compression_ratio']:.2%})")
+                    
+                    # Подготавливаем метаданные
+                    metadata = {
+                        'submission_id': str(submission.submission_id),
+                        'candidate_id': submission.candidate_id,
+                        'source_type': 'resume',
+                        'created_at': created_at,
+                        'model': ChromaConfig.EMBEDDING_MODEL,
+                        'original_length': preprocessing_stats['original_length'],
+                        'processed_length': preprocessing_stats['processed_length'],
+                        'compression_ratio': round(preprocessing_stats['compression_ratio'], 4)
                     }
-                )
-                
-                # Генерируем уникальный ID для документа в ChromaDB
-                chroma_doc_id = f"resume_{submission.submission_id}_{uuid.uuid4().hex[:8]}"
-                
-                # Получаем и предобрабатываем текст резюме
-                raw_text = getattr(submission, 'resume_raw_text', '')
-                processed_text, preprocessing_stats = preprocess_text_with_stats(
-                    raw_text, 
-                    config=None  # Используем конфигурацию по умолчанию для резюме
-                )
-                
-                # Логируем статистику предобработки
-                logger.info(f"📝 Предобработка резюме {submission.submission_id}: "
-                          f"было {preprocessing_stats['original_length']} символов, "
-                          f"стало {preprocessing_stats['processed_length']} символов "
-                          f"(сжатие: {preprocessing_stats['compression_ratio']:.2%})")
-                
-                # Подготавливаем метаданные
-                metadata = {
-                    'submission_id': str(submission.submission_id),
-                    'candidate_id': submission.candidate_id,
-                    'source_type': 'resume',
-                    'created_at': datetime.now().isoformat(),
-                    'model': ChromaConfig.EMBEDDING_MODEL,
-                    'original_length': preprocessing_stats['original_length'],
-                    'processed_length': preprocessing_stats['processed_length'],
-                    'compression_ratio': round(preprocessing_stats['compression_ratio'], 4)
-                }
-                
-                # Добавляем дополнительную информацию если есть
-                if submission.candidate:
-                    metadata.update({
-                        'candidate_name': f"{submission.candidate.first_name} {submission.candidate.last_name}",
-                        'candidate_email': submission.candidate.email
+                    
+                    # Добавляем дополнительную информацию если есть
+                    if submission.candidate:
+                        metadata.update({
+                            'candidate_name': f"{submission.candidate.first_name} {submission.candidate.last_name}",
+                            'candidate_email': submission.candidate.email
+                        })
+                    
+                    # Документ копится в пакет для ChromaDB и PostgreSQL (используем обработанный текст)
+                    writer.add({
+                        'source_type': 'resume',
+                        'source_id': str(submission.submission_id),
+                        'chroma_document_id': chroma_doc_id,
+                        'collection_name': ChromaConfig.RESUME_COLLECTION,
+                        'text_content': processed_text,  # Сохраняем обработанный текст
+                        'model_name': ChromaConfig.EMBEDDING_MODEL,
+                        'additional_metadata': metadata
                     })
-                
-                # Добавляем документ в ChromaDB (используем обработанный текст)
-                collection.add(
-                    documents=[processed_text],
-                    metadatas=[metadata],
-                    ids=[chroma_doc_id]
-                )
-                
-                # Сохраняем метаданные в PostgreSQL (используем обработанный текст)
-                embedding_crud.create_embedding_metadata(
-                    db=db,
-                    source_type='resume',
-                    source_id=str(submission.submission_id),
-                    chroma_document_id=chroma_doc_id,
-                    collection_name=ChromaConfig.RESUME_COLLECTION,
-                    text_content=processed_text,  # Сохраняем обработанный текст
-                    model_name=ChromaConfig.EMBEDDING_MODEL,
-                    additional_metadata=metadata
-                )
-                
-                processed_count += 1
-                logger.info(f"✅ Обработано резюме {submission.submission_id}")
-                
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"❌ Ошибка обработки резюме {submission.submission_id}: {str(e)}")
-                continue
-        
-        # Финальное обновление прогресса
-        self.update_state(
-            state='SUCCESS',
-            meta={
-                'progress': 100,
-                'status': 'Завершено',
-                'processed_count': processed_count,
-                'failed_count': failed_count,
-                'total_count': len(submissions)
-            }
-        )
+                    
+                except Exception as e:
+                    failed_count += 1
+                    logger.error(f"❌ Ошибка обработки резюме {submission.submission_id}: {str(e)}")
+                    continue
+            
+        processed_count = writer.processed
+        failed_count += writer.failed
+        
+        # Состояние SUCCESS Celery запишет в result backend из возвращаемого значения
         
         logger.info(f"🎉 Генерация эмбеддингов завершена. Обработано: {processed_count}, ошибок: {failed_count}")
         
@@ -232,6 +565,9 @@ def generate_job_embeddings(self, job_ids: Optional[List[int]] = None):
         job_ids = None
     
     db = database.get_session()
+    # Загруженные строки только читаются, а метаданные фиксируются пакетами: без
+    # expire_on_commit commit пакета не заставляет перечитывать оставшиеся строки по одной
+    db.expire_on_commit = False
     try:
         # Обновляем прогресс
         self.update_state(state='PROGRESS', meta={'progress': 5, 'status': 'Инициализация'})
@@ -249,24 +585,20 @@ def generate_job_embeddings(self, job_ids: Optional[List[int]] = None):
         
         # Получаем вакансии для обработки
         if job_ids:
-            jobs = []
-            for job_id in job_ids:
-                job = JobCRUD().get_by_id(db, job_id)
-                if job and getattr(job, 'job_description_raw_text', None):
-                    jobs.append(job)
-        else:
-            # Получаем все вакансии с сырым текстом, которые еще не обработаны
-            all_jobs = db.query(Job).filter(
+            # Все вакансии одним запросом IN (...) вместо get_by_id на каждый ID
+            jobs = db.query(Job).options(undefer_group('heavy_text')).filter(
+                Job.job_id.in_(job_ids),
                 Job.job_description_raw_text.isnot(None),
                 Job.job_description_raw_text != ''
             ).all()
-            
-            # Фильтруем те, для которых еще нет эмбеддингов
-            job_string_ids = [str(job.job_id) for job in all_jobs]
-            unprocessed_ids = embedding_crud.get_sources_without_embeddings(
-                db, 'job_description', job_string_ids
-            )
-            jobs = [job for job in all_jobs if str(job.job_id) in unprocessed_ids]
+        else:
+            # Получаем вакансии с сырым текстом, для которых еще нет эмбеддингов: отбор
+            # выполняется в SQL (NOT EXISTS), уже обработанные строки не загружаются
+            jobs = db.query(Job).options(undefer_group('heavy_text')).filter(
+                Job.job_description_raw_text.isnot(None),
+                Job.job_description_raw_text != '',
+                ~_has_embedding('job_description', Job.job_id)
+            ).all()
         
         if not jobs:
             logger.info("✅ Нет новых вакансий для обработки")
@@ -278,109 +610,80 @@ def generate_job_embeddings(self, job_ids: Optional[List[int]] = None):
         
         logger.info(f"📊 Найдено {len(jobs)} вакансий для обработки")
         
-        processed_count = 0
+        # Предобработка всех описаний вакансий до цикла
+        preprocessed = _preprocess_all(
+            [getattr(job, 'job_description_raw_text', '') or '' for job in jobs],
+            _JOB_PREPROC_CONFIG_ITEMS
+        )
+        
         failed_count = 0
         
-        for i, job in enumerate(jobs):
-            try:
-                # Обновляем прогресс
-                progress = 10 + (i / len(jobs)) * 80
-                self.update_state(
-                    state='PROGRESS', 
-                    meta={
-                        'progress': int(progress),
-                        'status': f'Обработка вакансии {i+1}/{len(jobs)}',
-                        'current_job_id': job.job_id
-                    }
-                )
-                
-                # Генерируем уникальный ID для документа в ChromaDB
-                chroma_doc_id = f"job_{job.job_id}_{uuid.uuid4().hex[:8]}"
-                
-                # Получаем и предобрабатываем текст описания вакансии
-                raw_text = getattr(job, 'job_description_raw_text', '')
-                processed_text, preprocessing_stats = preprocess_text_with_stats(
-                    raw_text,
-                    config={
-                        'remove_extra_whitespace': True,
-                        'normalize_line_breaks': True,
-                        'remove_duplicates': True,
-                        'min_sentence_length': 10,
-                        'normalize_unicode': True,
-                        'preserve_structure': True,
-                        'remove_empty_lines': True,
-                        'max_consecutive_newlines': 2
+        writer = _ChromaBatchWriter(
+            db, collection, 'вакансий',
+            on_progress=_throttled_progress(self, len(jobs), 'вакансии'),
+            duplicate_texts=_duplicate_texts(preprocessed)
+        )
+        # Время создания одно на весь запуск, а не вычисляется для каждого документа
+        created_at = datetime.now().isoformat()
+        with writer:
+            for i, job in enumerate(jobs):
+                try:
+                    # Генерируем уникальный ID для документа в ChromaDB
+                    chroma_doc_id = f"job_{job.job_id}_{secrets.token_hex(4)}"
+                    
+                    # Предобработанный текст описания вакансии
+                    processed_text, preprocessing_stats = preprocessed[i]
+                    
+                    # Логируем статистику предобработки
+                    logger.info(f"📝 Предобработка вакансии {job.job_id}: "
+                              f"было {preprocessing_stats['original_length']} символов, "
+                              f"стало {preprocessing_stats['processed_length']} символов "
+                              f"(сжатие: {preprocessing_stats['compression_ratio']:.2%})")
+                    
+                    # Подготавливаем метаданные
+                    metadata = {
+                        'job_id': job.job_id,
+                        'company_id': job.company_id,
+                        'source_type': 'job_description',
+                        'created_at': created_at,
+                        'model': ChromaConfig.EMBEDDING_MODEL,
+                        'job_title': job.title or '',
+                        'employment_type': job.employment_type or '',
+                        'experience_level': job.experience_level or '',
+                        'location': job.location or '',
+                        'is_active': job.is_active if job.is_active is not None else True,
+                        'original_length': preprocessing_stats['original_length'],
+                        'processed_length': preprocessing_stats['processed_length'],
+                        'compression_ratio': round(preprocessing_stats['compression_ratio'], 4)
                     }
-                )
-                
-                # Логируем статистику предобработки
-                logger.info(f"📝 Предобработка вакансии {job.job_id}: "
-                          f"было {preprocessing_stats['original_length']} символов, "
-                          f"стало {preprocessing_stats['processed_length']} символов "
-                          f"(сжатие: {preprocessing_stats['compression_ratio']:.2%})")
-                
-                # Подготавливаем метаданные
-                metadata = {
-                    'job_id': job.job_id,
-                    'company_id': job.company_id,
-                    'source_type': 'job_description',
-                    'created_at': datetime.now().isoformat(),
-                    'model': ChromaConfig.EMBEDDING_MODEL,
-                    'job_title': job.title or '',
-                    'employment_type': job.employment_type or '',
-                    'experience_level': job.experience_level or '',
-                    'location': job.location or '',
-                    'is_active': job.is_active if job.is_active is not None else True,
-                    'original_length': preprocessing_stats['original_length'],
-                    'processed_length': preprocessing_stats['processed_length'],
-                    'compression_ratio': round(preprocessing_stats['compression_ratio'], 4)
-                }
-                
-                # Добавляем информацию о компании если есть
-                if job.company:
-                    metadata.update({
-                        'company_name': job.company.name or '',
-                        'company_website': job.company.website or ''
+                    
+                    # Добавляем информацию о компании если есть
+                    if job.company:
+                        metadata.update({
+                            'company_name': job.company.name or '',
+                            'company_website': job.company.website or ''
+                        })
+                    
+                    # Документ копится в пакет для ChromaDB и PostgreSQL (используем обработанный текст)
+                    writer.add({
+                        'source_type': 'job_description',
+                        'source_id': str(job.job_id),
+                        'chroma_document_id': chroma_doc_id,
+                        'collection_name': ChromaConfig.JOB_COLLECTION,
+                        'text_content': processed_text,  # Сохраняем обработанный текст
+                        'model_name': ChromaConfig.EMBEDDING_MODEL,
+                        'additional_metadata': metadata
                     })
-                
-                # Добавляем документ в ChromaDB (используем обработанный текст)
-                collection.add(
-                    documents=[processed_text],
-                    metadatas=[metadata],
-                    ids=[chroma_doc_id]
-                )
-                
-                # Сохраняем метаданные в PostgreSQL (используем обработанный текст)
-                embedding_crud.create_embedding_metadata(
-                    db=db,
-                    source_type='job_description',
-                    source_id=str(job.job_id),
-                    chroma_document_id=chroma_doc_id,
-                    collection_name=ChromaConfig.JOB_COLLECTION,
-                    text_content=processed_text,  # Сохраняем обработанный текст
-                    model_name=ChromaConfig.EMBEDDING_MODEL,
-                    additional_metadata=metadata
-                )
-                
-                processed_count += 1
-                logger.info(f"✅ Обработана вакансия {job.job_id}")
-                
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"❌ Ошибка обработки вакансии {job.job_id}: {str(e)}")
-                continue
-        
-        # Финальное обновление прогресса
-        self.update_state(
-            state='SUCCESS',
-            meta={
-                'progress': 100,
-                'status': 'Завершено',
-                'processed_count': processed_count,
-                'failed_count': failed_count,
-                'total_count': len(jobs)
-            }
-        )
+                    
+                except Exception as e:
+                    failed_count += 1
+                    logger.error(f"❌ Ошибка обработки вакансии {job.job_id}: {str(e)}")
+                    continue
+            
+        processed_count = writer.processed
+        failed_count += writer.failed
+        
+        # Состояние SUCCESS Celery запишет в result backend из возвращаемого значения
         
         logger.info(f"🎉 Генерация эмбеддингов завершена. Обработано: {processed_count}, ошибок: {failed_count}")
         
@@ -445,23 +748,18 @@ def search_similar_resumes(self, query_text: str, limit: int = 10, min_similarit
         # Обрабатываем результаты
         similar_resumes = []
         if results['documents'] and results['documents'][0]:
-            for i, (doc, metadata, distance) in enumerate(zip(
-                results['documents'][0],
-                results['metadatas'][0],
-                results['distances'][0]
-            )):
-                # Конвертируем distance в similarity (ChromaDB возвращает расстояние, а не схожесть)
-                similarity = 1 - distance
-                
-                if similarity >= min_similarity:
-                    similar_resumes.append({
-                        'submission_id': metadata.get('submission_id'),
-                        'candidate_id': metadata.get('candidate_id'),
-                        'candidate_name': metadata.get('candidate_name'),
-                        'candidate_email': metadata.get('candidate_email'),
-                        'similarity': round(similarity, 3),
-                        'text_preview': doc[:200] + '...' if len(doc) > 200 else doc
-                    })
+            documents = results['documents'][0]
+            metadatas = results['metadatas'][0]
+            for i, similarity in _similar_above_threshold(results['distances'][0], min_similarity):
+                doc, metadata = documents[i], metadatas[i]
+                similar_resumes.append({
+                    'submission_id': metadata.get('submission_id'),
+                    'candidate_id': metadata.get('candidate_id'),
+                    'candidate_name': metadata.get('candidate_name'),
+                    'candidate_email': metadata.get('candidate_email'),
+                    'similarity': round(similarity, 3),
+                    'text_preview': doc[:200] + '...' if len(doc) > 200 else doc
+                })
         
         logger.info(f"✅ Найдено {len(similar_resumes)} похожих резюме")
         
@@ -510,27 +808,22 @@ def search_similar_jobs(self, query_text: str, limit: int = 10, min_similarity:
         # Обрабатываем результаты
         similar_jobs = []
         if results['documents'] and results['documents'][0]:
-            for i, (doc, metadata, distance) in enumerate(zip(
-                results['documents'][0],
-                results['metadatas'][0],
-                results['distances'][0]
-            )):
-                # Конвертируем distance в similarity
-                similarity = 1 - distance
-                
-                if similarity >= min_similarity:
-                    similar_jobs.append({
-                        'job_id': metadata.get('job_id'),
-                        'company_id': metadata.get('company_id'),
-                        'company_name': metadata.get('company_name'),
-                        'job_title': metadata.get('job_title'),
-                        'employment_type': metadata.get('employment_type'),
-                        'experience_level': metadata.get('experience_level'),
-                        'location': metadata.get('location'),
-                        'is_active': metadata.get('is_active'),
-                        'similarity': round(similarity, 3),
-                        'text_preview': doc[:200] + '...' if len(doc) > 200 else doc
-                    })
+            documents = results['documents'][0]
+            metadatas = results['metadatas'][0]
+            for i, similarity in _similar_above_threshold(results['distances'][0], min_similarity):
+                doc, metadata = documents[i], metadatas[i]
+                similar_jobs.append({
+                    'job_id': metadata.get('job_id'),
+                    'company_id': metadata.get('company_id'),
+                    'company_name': metadata.get('company_name'),
+                    'job_title': metadata.get('job_title'),
+                    'employment_type': metadata.get('employment_type'),
+                    'experience_level': metadata.get('experience_level'),
+                    'location': metadata.get('location'),
+                    'is_active': metadata.get('is_active'),
+                    'similarity': round(similarity, 3),
+                    'text_preview': doc[:200] + '...' if len(doc) > 200 else doc
+                })
         
         logger.info(f"✅ Найдено {len(similar_jobs)} похожих вакансий")
         
@@ -4,7 +4,6 @@ Fillout API tasks for retrieving resume and company data - ПОЛНАЯ ВЕРС
 """
 
 import os
-import requests
 import json
 from datetime import datetime
 from typing import Dict, List, Any, Optional
@@ -16,6 +15,7 @@ from uuid import UUID
 
 from common.celery_app.celery_app import celery_app
 from common.database.config import database
+from common.utils.http_session import get_http_session
 from common.models.candidates import (
     Submission, Candidate, Address, Education, SalaryExpectation,
     submission_competencies, submission_roles, submission_industries, submission_locations
@@ -121,7 +121,7 @@ def fetch_resume_data(self) -> Dict[str, Any]:
                 'offset': (page - 1) * limit
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=60)
+            response = get_http_session().get(url, headers=headers, params=params, timeout=60)
             response.raise_for_status()
             
             data = response.json()
@@ -385,14 +385,15 @@ def _get_or_create_candidate(db: Session, candidate_data: Dict[str, Any]) -> Can
     candidate = db.query(Candidate).filter(Candidate.email == email).first()
     
     if not candidate:
+        now = datetime.utcnow()
         candidate = Candidate(
             first_name=candidate_data.get('first_name', ''),
             last_name=candidate_data.get('last_name', ''),
             email=email,
             mobile_number=candidate_data.get('mobile_number'),
             linkedin_url=candidate_data.get('linkedin_url'),
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         db.add(candidate)
         db.flush()
@@ -637,7 +638,7 @@ def fetch_company_data(self) -> Dict[str, Any]:
                 'offset': (page - 1) * limit
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=60)
+            response = get_http_session().get(url, headers=headers, params=params, timeout=60)
             response.raise_for_status()
             
             data = response.json()
@@ -743,14 +744,17 @@ def _process_company_submission(db: Session, submission_data: Dict[str, Any]) ->
             logger.info(f"📝 Компания '{company_name}' уже существует")
             return False
         
+        # Компания, вакансия и контакт создаются с одним временем создания
+        now = datetime.utcnow()
+        
         # Создаем компанию
         logger.info(f"✨ Создание новой компании: '{company_name}'")
         company = Company(
             name=company_name,
             website=extracted_data['company'].get('website'),
             description=extracted_data['job'].get('description'),
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         db.add(company)
         db.flush()
@@ -767,8 +771,8 @@ def _process_company_submission(db: Session, submission_data: Dict[str, Any]) ->
                 description=job_description,
                 job_description_url=extracted_data['job'].get('job_description_url'),
                 is_active=True,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                created_at=now,
+                updated_at=now
             )
             db.add(job)
             logger.info(f"✅ Работа создана")
@@ -789,8 +793,8 @@ def _process_company_submission(db: Session, submission_data: Dict[str, Any]) ->
                 email=contact_email,
                 job_title=extracted_data['contact'].get('job_title'),
                 is_primary=True,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
+                created_at=now,
+                updated_at=now
             )
             db.add(contact)
             logger.info(f"✅ Контакт создан с email: {contact_email}")
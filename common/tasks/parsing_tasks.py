@@ -14,6 +14,7 @@ from sqlalchemy import text
 
 from common.celery_app.celery_app import celery_app
 from common.database.config import database
+from common.utils.http_session import get_http_session
 from common.models.candidates import Submission
 from common.models.companies import Job
 
@@ -22,6 +23,12 @@ load_dotenv()
 
 logger = get_task_logger(__name__)
 
+# Регулярные выражения очистки текста компилируются один раз при импорте
+_WHITESPACE_RE = re.compile(r'\s+')
+_LINE_BREAK_RE = re.compile(r'\r\n|\r')
+_INLINE_SPACE_RE = re.compile(r'[ \t]+')
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+
 
 @celery_app.task(
     bind=True,
@@ -223,7 +230,7 @@ def _extract_text_from_url(file_url: str) -> Optional[str]:
         logger.info(f"📥 Загрузка файла: {file_url}")
         
         # Загружаем файл
-        response = requests.get(file_url, timeout=30)
+        response = get_http_session().get(file_url, timeout=30)
         response.raise_for_status()
         
         # Определяем тип файла по URL или Content-Type
@@ -568,7 +575,7 @@ def _extract_with_olefile(doc_content: bytes) -> Optional[str]:
             
             if found_text:
                 text = ' '.join(found_text)
-                text = re.sub(r'\s+', ' ', text).strip()
+                text = _WHITESPACE_RE.sub(' ', text).strip()
                 if len(text) > 50:
                     logger.info(f"📄 DOC обработан olefile: {len(text)} символов")
                     return text
@@ -641,7 +648,7 @@ def _extract_text_from_binary(binary_content: bytes) -> Optional[str]:
                     extracted_text = ' '.join(text_parts)
                     
                     # Очищаем от лишних пробелов
-                    extracted_text = re.sub(r'\s+', ' ', extracted_text).strip()
+                    extracted_text = _WHITESPACE_RE.sub(' ', extracted_text).strip()
                     
                     # Проверяем, что получился осмысленный текст
                     if len(extracted_text) > 50 and len(extracted_text.split()) > 10:
@@ -673,13 +680,13 @@ def _clean_extracted_text(raw_text: str) -> str:
         return ""
     
     # Нормализация переносов строк
-    text = re.sub(r'\r\n|\r', '\n', raw_text)
+    text = _LINE_BREAK_RE.sub('\n', raw_text)
     
     # Удаление лишних пробелов и табуляций
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = _INLINE_SPACE_RE.sub(' ', text)
     
     # Удаление множественных переносов строк (больше 2 подряд)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _EXCESS_NEWLINES_RE.sub('\n\n', text)
     
     # Удаление пробелов в начале и конце строк
     lines = [line.strip() for line in text.split('\n')]
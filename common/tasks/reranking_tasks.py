@@ -4,18 +4,22 @@ Reranking tasks for improving matching quality between resumes and jobs
 Задача 4: Реранкинг резюме и вакансий после генерации эмбеддингов
 """
 
+import logging
 import uuid
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from celery.utils.log import get_task_logger
 from dotenv import load_dotenv
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
 from uuid import UUID
 from celery.signals import worker_process_init
 
 from common.celery_app.celery_app import celery_app
 from common.database.config import database
-from common.database.operations.analysis_operations import RerankerAnalysisResultCRUD
+from common.database.operations.analysis_operations import (
+    RerankerAnalysisResultCRUD, invalidate_job_summary, unique_analysis_rows
+)
 from common.database.operations.embedding_operations import embedding_crud
 from common.database.operations.candidate_operations import SubmissionCRUD
 from common.database.operations.company_operations import JobCRUD
@@ -32,18 +36,115 @@ load_dotenv()
 
 logger = get_task_logger(__name__)
 
+# Сколько элементов выборки ChromaDB выводить в диагностических логах
+DIAG_SAMPLE_SIZE = 5
+
 # CRUD экземпляры
 analysis_crud = RerankerAnalysisResultCRUD()
 submission_crud = SubmissionCRUD()
 job_crud = JobCRUD()
 
 
+def _load_submissions(db: Session, metadatas: List[Dict[str, Any]]) -> Dict[str, Submission]:
+    """Загрузка заявок (с кандидатами) по source_id из метаданных ChromaDB одним запросом"""
+    submission_ids = set()
+    for metadata in metadatas:
+        source_id = metadata.get('source_id') if isinstance(metadata, dict) else None
+        if not source_id:
+            continue
+        try:
+            submission_ids.add(UUID(str(source_id)))
+        except ValueError:
+            logger.warning(f"⚠️ Некорректный source_id заявки: {source_id}")
+    
+    if not submission_ids:
+        return {}
+    
+    submissions = db.query(Submission).options(
+        selectinload(Submission.candidate)
+    ).filter(Submission.submission_id.in_(submission_ids)).all()
+    return {str(submission.submission_id): submission for submission in submissions}
+
+
+def _load_jobs(db: Session, metadatas: List[Dict[str, Any]]) -> Dict[str, Job]:
+    """Загрузка вакансий по source_id из метаданных ChromaDB одним запросом"""
+    job_ids = set()
+    for metadata in metadatas:
+        source_id = metadata.get('source_id') if isinstance(metadata, dict) else None
+        if not source_id:
+            continue
+        try:
+            job_ids.add(int(source_id))
+        except (TypeError, ValueError):
+            logger.warning(f"⚠️ Некорректный source_id вакансии: {source_id}")
+    
+    if not job_ids:
+        return {}
+    
+    jobs = db.query(Job).filter(Job.job_id.in_(job_ids)).all()
+    return {str(job.job_id): job for job in jobs}
+
+
+def _build_analysis_row(
+    job: Job,
+    submission: Submission,
+    rank_position: int,
+    original_distance: float,
+    rerank_score: float,
+    search_params: Dict[str, Any],
+    workflow_stats: Dict[str, Any],
+    reranker_model: str,
+    total_found: int,
+    analysis_type: str
+) -> Dict[str, Any]:
+    """Строка reranker_analysis_results для пары вакансия-резюме (общая для обоих направлений)"""
+    original_similarity = max(0.0, 1.0 - original_distance)
+    
+    # Нормализуем rerank_score от [-10, +10] к [0, 1]
+    normalized_rerank_score = max(0.0, min(1.0, (rerank_score + 10.0) / 20.0))
+    
+    # Вычисляем финальный score (комбинация original similarity и normalized rerank score)
+    final_score = (original_similarity * 0.3) + (normalized_rerank_score * 0.7)
+    
+    candidate = submission.candidate
+    return {
+        'job_id': job.job_id,
+        'submission_id': submission.submission_id,
+        'original_similarity': original_similarity,
+        'rerank_score': rerank_score,
+        'final_score': final_score,
+        'score_improvement': normalized_rerank_score - original_similarity,
+        'rank_position': rank_position,
+        'search_params': search_params,
+        'reranker_model': reranker_model,
+        'workflow_stats': workflow_stats,
+        'job_title': job.title or 'Unknown',
+        'company_id': job.company_id,
+        'candidate_name': f"{candidate.first_name or ''} {candidate.last_name or ''}".strip() or 'Unknown',
+        'candidate_email': candidate.email or 'Unknown',
+        'total_candidates_found': total_found,
+        'analysis_type': analysis_type
+    }
+
+
+def _insert_analysis_rows(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """Сохранение результатов реранкинга одним INSERT (executemany) и одним commit"""
+    rows = unique_analysis_rows(rows)
+    if not rows:
+        return
+    db.execute(insert(RerankerAnalysisResult), rows)
+    db.commit()
+    invalidate_job_summary(*{row['job_id'] for row in rows})
+    logger.info(f"💾 Сохранено {len(rows)} результатов реранкинга одним пакетом")
+
+
 @celery_app.task(
     bind=True,
     name='common.tasks.reranking_tasks.rerank_resumes_for_job',
     soft_time_limit=600,
     time_limit=720,
-    max_retries=3
+    max_retries=3,
+    ignore_result=True
 )
 def rerank_resumes_for_job(self, job_id: int, top_k: int = 50) -> Dict[str, Any]:
     """
@@ -114,7 +215,9 @@ def rerank_resumes_for_job(self, job_id: int, top_k: int = 50) -> Dict[str, Any]
             logger.info(f"🔍 Поиск топ-{top_k} похожих резюме в ChromaDB")
             resume_collection = chroma_client.get_resume_collection()
             
-            if resume_collection.count() == 0:
+            # Размер коллекции запрашивается в ChromaDB один раз
+            collection_size = resume_collection.count()
+            if collection_size == 0:
                 logger.warning("⚠️ Коллекция резюме пуста")
                 return {
                     'status': 'completed',
@@ -126,7 +229,7 @@ def rerank_resumes_for_job(self, job_id: int, top_k: int = 50) -> Dict[str, Any]
             # Поиск похожих резюме
             search_results = resume_collection.query(
                 query_texts=[job_text],
-                n_results=min(top_k, resume_collection.count()),
+                n_results=min(top_k, collection_size),
                 include=['documents', 'metadatas', 'distances']
             )
             
@@ -188,11 +291,30 @@ def rerank_resumes_for_job(self, job_id: int, top_k: int = 50) -> Dict[str, Any]
                     'total_found': len(documents)
                 }
             
-            # 7. Сохраняем результаты в PostgreSQL пакетами для экономии памяти
+            # 7. Сохраняем результаты в PostgreSQL одним пакетным INSERT
             logger.info(f"💾 Сохранение {len(reranked_results)} результатов реранкинга")
             
-            batch_size = 1  # Размер пакета для сохранения
-            batch_results = []
+            # Заявки вместе с кандидатами загружаем одним запросом, а не по одной на результат
+            submissions_by_id = _load_submissions(db, metadatas)
+            rows = []
+            
+            # Параметры поиска и статистика workflow одинаковы для всех строк,
+            # поэтому собираются один раз до цикла
+            search_params = {
+                'top_k': top_k,
+                'min_similarity': 0.0,
+                'min_rerank_score': -10.0,
+                'search_type': 'job_to_resumes',
+                'query_text_length': len(job_text),
+                'original_text_length': original_length,
+                'text_truncated': original_length > 32000
+            }
+            workflow_stats = {
+                'total_candidates_found': len(documents),
+                'reranked_candidates': len(reranked_results),
+                'processing_time': datetime.utcnow().isoformat(),
+                'chroma_collection': ChromaConfig.RESUME_COLLECTION
+            }
             
             for rank_position, (doc_idx, rerank_score) in enumerate(reranked_results, 1):
                 try:
@@ -208,81 +330,26 @@ def rerank_resumes_for_job(self, job_id: int, top_k: int = 50) -> Dict[str, Any]
                         continue
                     
                     # Получаем submission
-                    submission = submission_crud.get_by_id(db, source_id)
+                    submission = submissions_by_id.get(str(source_id))
                     if not submission:
                         logger.warning(f"⚠️ Submission {source_id} не найден")
                         continue
                     
-                    # Создаем запись результата реранкинга
-                    original_distance = distances[doc_idx] if doc_idx < len(distances) else 0.0
-                    original_similarity = max(0.0, 1.0 - original_distance)
-                    
-                    # Нормализуем rerank_score от [-10, +10] к [0, 1]
-                    normalized_rerank_score = max(0.0, min(1.0, (rerank_score + 10.0) / 20.0))
-                    
-                    # Вычисляем финальный score (комбинация original similarity и normalized rerank score)
-                    final_score = (original_similarity * 0.3) + (normalized_rerank_score * 0.7)
-                    score_improvement = normalized_rerank_score - original_similarity
-                    
-                    # Подготавливаем параметры поиска
-                    search_params = {
-                        'top_k': top_k,
-                        'min_similarity': 0.0,
-                        'min_rerank_score': -10.0,
-                        'search_type': 'job_to_resumes',
-                        'query_text_length': len(job_text),
-                        'original_text_length': original_length,
-                        'text_truncated': original_length > 32000
-                    }
-                    
-                    # Статистика workflow
-                    workflow_stats = {
-                        'total_candidates_found': len(documents),
-                        'reranked_candidates': len(reranked_results),
-                        'processing_time': datetime.utcnow().isoformat(),
-                        'chroma_collection': ChromaConfig.RESUME_COLLECTION
-                    }
-                    
                     # Создаем запись анализа
-                    analysis_result = RerankerAnalysisResult(
-                        job_id=job_id,
-                        submission_id=submission.submission_id,
-                        original_similarity=original_similarity,
-                        rerank_score=rerank_score,
-                        final_score=final_score,
-                        score_improvement=score_improvement,
-                        rank_position=rank_position,
-                        search_params=search_params,
-                        reranker_model=reranker.model_name,
-                        workflow_stats=workflow_stats,
-                        job_title=job.title or 'Unknown',
-                        company_id=job.company_id,
-                        candidate_name=f"{submission.candidate.first_name or ''} {submission.candidate.last_name or ''}".strip() or 'Unknown',
-                        candidate_email=submission.candidate.email or 'Unknown',
-                        total_candidates_found=len(documents),
-                        analysis_type='job_to_resumes_rerank'
-                    )
-                    
-                    batch_results.append(analysis_result)
+                    original_distance = distances[doc_idx] if doc_idx < len(distances) else 0.0
+                    rows.append(_build_analysis_row(
+                        job, submission, rank_position, original_distance, rerank_score,
+                        search_params, workflow_stats, reranker.model_name,
+                        total_found=len(documents), analysis_type='job_to_resumes_rerank'
+                    ))
                     processed_count += 1
                     
-                    # Сохраняем пакетами для экономии памяти
-                    if len(batch_results) >= batch_size:
-                        db.add_all(batch_results)
-                        db.commit()
-                        logger.info(f"💾 Сохранен пакет из {len(batch_results)} результатов реранкинга")
-                        batch_results.clear()  # Очищаем память
-                    
                 except Exception as e:
-                    logger.error(f"❌ Ошибка сохранения результата реранкинга: {e}")
+                    logger.error(f"❌ Ошибка подготовки результата реранкинга: {e}")
                     error_count += 1
                     continue
             
-            # Сохраняем оставшиеся результаты
-            if batch_results:
-                db.add_all(batch_results)
-                db.commit()
-                logger.info(f"💾 Сохранен финальный пакет из {len(batch_results)} результатов реранкинга")
+            _insert_analysis_rows(db, rows)
             
             logger.info(f"✅ Реранкинг резюме для вакансии {job_id} завершен: {processed_count} обработано, {error_count} ошибок")
             
@@ -311,7 +378,8 @@ def rerank_resumes_for_job(self, job_id: int, top_k: int = 50) -> Dict[str, Any]
     name='common.tasks.reranking_tasks.rerank_jobs_for_resume',
     soft_time_limit=600,
     time_limit=720,
-    max_retries=3
+    max_retries=3,
+    ignore_result=True
 )
 def rerank_jobs_for_resume(self, submission_id: str, top_k: int = 50) -> Dict[str, Any]:
     """
@@ -383,7 +451,9 @@ def rerank_jobs_for_resume(self, submission_id: str, top_k: int = 50) -> Dict[st
             logger.info(f"🔍 Поиск топ-{top_k} подходящих вакансий в ChromaDB")
             job_collection = chroma_client.get_job_collection()
             
-            if job_collection.count() == 0:
+            # Размер коллекции запрашивается в ChromaDB один раз
+            collection_size = job_collection.count()
+            if collection_size == 0:
                 logger.warning("⚠️ Коллекция вакансий пуста")
                 return {
                     'status': 'completed',
@@ -395,7 +465,7 @@ def rerank_jobs_for_resume(self, submission_id: str, top_k: int = 50) -> Dict[st
             # Поиск похожих вакансий
             search_results = job_collection.query(
                 query_texts=[resume_text],
-                n_results=min(top_k, job_collection.count()),
+                n_results=min(top_k, collection_size),
                 include=['documents', 'metadatas', 'distances']
             )
             
@@ -457,20 +527,44 @@ def rerank_jobs_for_resume(self, submission_id: str, top_k: int = 50) -> Dict[st
                     'total_found': len(documents)
                 }
             
-            # 7. Сохраняем результаты в PostgreSQL пакетами для экономии памяти
+            # 7. Сохраняем результаты в PostgreSQL одним пакетным INSERT
             logger.info(f"💾 Сохранение {len(reranked_results)} результатов реранкинга")
             
-            batch_size = 10  # Размер пакета для сохранения
-            batch_results = []
+            # Вакансии загружаем одним запросом, а не по одной на результат
+            jobs_by_id = _load_jobs(db, metadatas)
+            rows = []
+            
+            # Параметры поиска и статистика workflow одинаковы для всех строк,
+            # поэтому собираются один раз до цикла
+            search_params = {
+                'top_k': top_k,
+                'min_similarity': 0.0,
+                'min_rerank_score': -10.0,
+                'search_type': 'resume_to_jobs',
+                'query_text_length': len(resume_text),
+                'original_text_length': original_length,
+                'text_truncated': original_length > 32000
+            }
+            workflow_stats = {
+                'total_candidates_found': len(documents),
+                'reranked_candidates': len(reranked_results),
+                'processing_time': datetime.utcnow().isoformat(),
+                'chroma_collection': ChromaConfig.JOB_COLLECTION
+            }
+            
+            # Уровень логгера проверяется один раз: при выключенном DEBUG
+            # f-строки диагностики не форматируются на каждой строке
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
             
             for rank_position, (doc_idx, rerank_score) in enumerate(reranked_results, 1):
                 try:
                     # Подробное логирование для диагностики вложенных списков и неверных типов
-                    logger.error(f"[CHECK] doc_idx={doc_idx} ({type(doc_idx)}), distances type={type(distances)}, metadatas type={type(metadatas)}")
-                    if isinstance(distances, list) and len(distances) > 0:
-                        logger.error(f"[CHECK] distances[0] type={type(distances[0])}, value={distances[0]}")
-                    if isinstance(metadatas, list) and len(metadatas) > 0:
-                        logger.error(f"[CHECK] metadatas[0] type={type(metadatas[0])}, value={metadatas[0]}")
+                    if debug_enabled:
+                        logger.debug(f"[CHECK] doc_idx={doc_idx} ({type(doc_idx)}), distances type={type(distances)}, metadatas type={type(metadatas)}")
+                        if isinstance(distances, list) and len(distances) > 0:
+                            logger.debug(f"[CHECK] distances[0] type={type(distances[0])}, value={distances[0]}")
+                        if isinstance(metadatas, list) and len(metadatas) > 0:
+                            logger.debug(f"[CHECK] metadatas[0] type={type(metadatas[0])}, value={metadatas[0]}")
                     if not isinstance(doc_idx, int):
                         logger.error(f"[FATAL] doc_idx не int: {type(doc_idx)}, value={doc_idx}")
                         error_count += 1
@@ -494,88 +588,34 @@ def rerank_jobs_for_resume(self, submission_id: str, top_k: int = 50) -> Dict[st
                         continue
                     
                     # Получаем вакансию
-                    job = job_crud.get_by_id(db, job_id)
+                    job = jobs_by_id.get(str(job_id))
                     if not job:
                         logger.warning(f"⚠️ Вакансия {job_id} не найдена")
                         continue
                     
-                    # Создаем запись результата реранкинга
-                    original_distance = distances[doc_idx] if doc_idx < len(distances) else 0.0
-                    original_similarity = max(0.0, 1.0 - original_distance)
-                    
-                    # Нормализуем rerank_score от [-10, +10] к [0, 1]
-                    normalized_rerank_score = max(0.0, min(1.0, (rerank_score + 10.0) / 20.0))
-                    
-                    # Вычисляем финальный score (комбинация original similarity и normalized rerank score)
-                    final_score = (original_similarity * 0.3) + (normalized_rerank_score * 0.7)
-                    score_improvement = normalized_rerank_score - original_similarity
-                    
-                    # Подготавливаем параметры поиска
-                    search_params = {
-                        'top_k': top_k,
-                        'min_similarity': 0.0,
-                        'min_rerank_score': -10.0,
-                        'search_type': 'resume_to_jobs',
-                        'query_text_length': len(resume_text),
-                        'original_text_length': original_length,
-                        'text_truncated': original_length > 32000
-                    }
-                    
-                    # Статистика workflow
-                    workflow_stats = {
-                        'total_candidates_found': len(documents),
-                        'reranked_candidates': len(reranked_results),
-                        'processing_time': datetime.utcnow().isoformat(),
-                        'chroma_collection': ChromaConfig.JOB_COLLECTION
-                    }
-                    
                     # Создаем запись анализа
-                    analysis_result = RerankerAnalysisResult(
-                        job_id=job_id,
-                        submission_id=submission.submission_id,
-                        original_similarity=original_similarity,
-                        rerank_score=rerank_score,
-                        final_score=final_score,
-                        score_improvement=score_improvement,
-                        rank_position=rank_position,
-                        search_params=search_params,
-                        reranker_model=reranker.model_name,
-                        workflow_stats=workflow_stats,
-                        job_title=job.title or 'Unknown',
-                        company_id=job.company_id,
-                        candidate_name=f"{submission.candidate.first_name or ''} {submission.candidate.last_name or ''}".strip() or 'Unknown',
-                        candidate_email=submission.candidate.email or 'Unknown',
-                        total_candidates_found=len(documents),
-                        analysis_type='resume_to_jobs_rerank'
-                    )
-                    
-                    batch_results.append(analysis_result)
+                    original_distance = distances[doc_idx] if doc_idx < len(distances) else 0.0
+                    rows.append(_build_analysis_row(
+                        job, submission, rank_position, original_distance, rerank_score,
+                        search_params, workflow_stats, reranker.model_name,
+                        total_found=len(documents), analysis_type='resume_to_jobs_rerank'
+                    ))
                     processed_count += 1
                     
-                    # Сохраняем пакетами для экономии памяти
-                    if len(batch_results) >= batch_size:
-                        db.add_all(batch_results)
-                        db.commit()
-                        logger.info(f"💾 Сохранен пакет из {len(batch_results)} результатов реранкинга")
-                        batch_results.clear()  # Очищаем память
-                    
                 except Exception as e:
                     import traceback
-                    logger.error(f"❌ Ошибка сохранения результата реранкинга: {e}\nTRACEBACK:\n{traceback.format_exc()}")
-                    logger.error(f"[EXCEPT-DIAG] doc_idx={locals().get('doc_idx', None)} ({type(locals().get('doc_idx', None))}), distances type={type(locals().get('distances', None))}, metadatas type={type(locals().get('metadatas', None))}")
-                    try:
-                        logger.error(f"[EXCEPT-DIAG] distances={locals().get('distances', None)}")
-                        logger.error(f"[EXCEPT-DIAG] metadatas={locals().get('metadatas', None)}")
-                    except Exception as diag_e:
-                        logger.error(f"[EXCEPT-DIAG] Ошибка при логировании distances/metadatas: {diag_e}")
+                    logger.error(f"❌ Ошибка подготовки результата реранкинга: {e}\nTRACEBACK:\n{traceback.format_exc()}")
+                    # В диагностику попадают только первые элементы: полные списки
+                    # на каждую ошибку превращают лог в O(N^2) по объему
+                    logger.error(
+                        f"[EXCEPT-DIAG] doc_idx={doc_idx!r}, "
+                        f"distances[:{DIAG_SAMPLE_SIZE}]={distances[:DIAG_SAMPLE_SIZE]} (из {len(distances)}), "
+                        f"metadatas[:{DIAG_SAMPLE_SIZE}]={metadatas[:DIAG_SAMPLE_SIZE]} (из {len(metadatas)})"
+                    )
                     error_count += 1
                     continue
             
-            # Сохраняем оставшиеся результаты
-            if batch_results:
-                db.add_all(batch_results)
-                db.commit()
-                logger.info(f"💾 Сохранен финальный пакет из {len(batch_results)} результатов реранкинга")
+            _insert_analysis_rows(db, rows)
             
             logger.info(f"✅ Реранкинг вакансий для резюме {submission_id} завершен: {processed_count} обработано, {error_count} ошибок")
             
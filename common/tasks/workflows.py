@@ -5,6 +5,7 @@ Workflow tasks for orchestrating the processing pipeline
 from typing import Dict, Any
 from celery.utils.log import get_task_logger
 from celery import group, chain, chord, signature
+from sqlalchemy import and_, or_
 from common.celery_app.celery_app import celery_app
 from common.database.operations.embedding_operations import embedding_crud
 from common.database.config import database
@@ -269,16 +270,15 @@ def launch_reranking_tasks(self, results) -> Dict[str, Any]:
     logger.info("🔄 [RERANK] Задача launch_reranking_tasks вызвана!")
     db = database.get_session()
     try:
-        # Получаем все source_id для резюме
-        resume_ids = [e.source_id for e in db.query(embedding_crud.model).filter(
-            embedding_crud.model.collection_name == ChromaConfig.RESUME_COLLECTION,
-            embedding_crud.model.source_type == 'resume'
-        ).all()]
-        # Получаем все source_id для вакансий
-        job_ids = [e.source_id for e in db.query(embedding_crud.model).filter(
-            embedding_crud.model.collection_name == ChromaConfig.JOB_COLLECTION,
-            embedding_crud.model.source_type == 'job_description'
-        ).all()]
+        # source_id резюме и вакансий одним запросом, только нужные колонки
+        # (без загрузки ORM-объектов с JSONB-метаданными)
+        model = embedding_crud.model
+        rows = db.query(model.source_type, model.source_id).filter(or_(
+            and_(model.collection_name == ChromaConfig.RESUME_COLLECTION, model.source_type == 'resume'),
+            and_(model.collection_name == ChromaConfig.JOB_COLLECTION, model.source_type == 'job_description')
+        )).all()
+        resume_ids = [row.source_id for row in rows if row.source_type == 'resume']
+        job_ids = [row.source_id for row in rows if row.source_type == 'job_description']
         logger.info(f"[RERANK] Найдено {len(resume_ids)} resume_ids: {resume_ids}")
         logger.info(f"[RERANK] Найдено {len(job_ids)} job_ids: {job_ids}")
         if not resume_ids and not job_ids:
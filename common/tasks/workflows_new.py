@@ -17,6 +17,14 @@ except ImportError:
 logger = get_task_logger(__name__)
 
 
+def _embeddings_group():
+    """Параллельная генерация эмбеддингов резюме и вакансий"""
+    return group([
+        app.signature('common.tasks.embedding_tasks.generate_resume_embeddings', immutable=True),
+        app.signature('common.tasks.embedding_tasks.generate_job_embeddings', immutable=True)
+    ])
+
+
 @app.task(
     bind=True, 
     name='common.tasks.workflows.run_full_processing_pipeline',
@@ -36,65 +44,37 @@ def run_full_processing_pipeline(self) -> Dict[str, Any]:
     5. Сохранение результатов
     
     Returns:
-        Результат выполнения цепочки
+        Информация о запущенной цепочке (ID для отслеживания)
     """
     logger.info("🔗 Запуск полного цикла обработки данных HR Analysis")
     
     try:
-        results = {
-            'status': 'started',
-            'timestamp': datetime.now().isoformat(),
-            'steps': []
+        # Этапы связываются chain: воркер не блокируется на .get() в ожидании каждого из них.
+        # Подписи этапов immutable - они не принимают результат предыдущего.
+        # Эмбеддинги резюме и вакансий независимы и считаются параллельно (group);
+        # колбэк chord получает результаты группы: зарегистрированная задача
+        # launch_reranking_tasks (common.tasks.workflows) принимает их аргументом results
+        pipeline = chain(
+            app.signature('common.tasks.fillout_tasks.fetch_resume_data', immutable=True),
+            app.signature('common.tasks.fillout_tasks.fetch_company_data', immutable=True),
+            _embeddings_group(),
+            app.signature('common.tasks.workflows.launch_reranking_tasks')
+        )
+        result = pipeline.apply_async()
+        
+        logger.info(f"✅ Полный цикл обработки запущен: ID={result.id}")
+        return {
+            'status': 'pipeline_started',
+            'pipeline_id': result.id,
+            'stages': [
+                'fetch_resume_data',
+                'fetch_company_data',
+                'generate_resume_embeddings + generate_job_embeddings',
+                'launch_reranking_tasks'
+            ],
+            'timestamp': datetime.now().isoformat()
         }
         
-        # Шаг 1: Получение данных из Fillout
-        logger.info("📋 Шаг 1: Получение данных из Fillout")
-        resume_result = app.send_task(
-            'common.tasks.fillout_tasks.fetch_resume_data'
-        ).get(timeout=300)
-        results['steps'].append({
-            'step': 'fetch_resume_data',
-            'status': 'completed',
-            'result': resume_result
-        })
-        
-        company_result = app.send_task(
-            'common.tasks.fillout_tasks.fetch_company_data'
-        ).get(timeout=300)
-        results['steps'].append({
-            'step': 'fetch_company_data',
-            'status': 'completed',
-            'result': company_result
-        })
-        
-        # Шаг 2: Генерация эмбеддингов
-        logger.info("🧠 Шаг 2: Генерация эмбеддингов")
-        embeddings_result = app.send_task(
-            'common.tasks.embedding_tasks.generate_all_embeddings'
-        ).get(timeout=600)
-        results['steps'].append({
-            'step': 'generate_all_embeddings',
-            'status': 'completed',
-            'result': embeddings_result
-        })
-        
-        # Шаг 3: Запуск задач реранжирования
-        logger.info("🎯 Шаг 3: Запуск задач реранжирования")
-        reranking_result = app.send_task(
-            'common.tasks.workflows.launch_reranking_tasks'
-        ).get(timeout=900)
-        results['steps'].append({
-            'step': 'launch_reranking_tasks',
-            'status': 'completed',
-            'result': reranking_result
-        })
-        
-        results['status'] = 'completed'
-        results['total_time'] = (datetime.now() - datetime.fromisoformat(results['timestamp'])).total_seconds()
-        
-        logger.info(f"✅ Полный цикл обработки завершен за {results['total_time']} секунд")
-        return results
-        
     except Exception as e:
         logger.error(f"❌ Ошибка в полном цикле обработки: {e}")
         return {
@@ -123,12 +103,11 @@ def run_parsing_only(self) -> Dict[str, Any]:
         ])
         
         results = parse_tasks.apply_async()
-        parsed_results = results.get(timeout=600)
         
-        logger.info("✅ Парсинг задачи завершены")
+        logger.info(f"✅ Парсинг задачи запущены: ID={results.id}")
         return {
-            'status': 'completed',
-            'results': parsed_results,
+            'status': 'started',
+            'group_id': results.id,
             'timestamp': datetime.now().isoformat()
         }
         
@@ -153,13 +132,12 @@ def run_embeddings_only(self) -> Dict[str, Any]:
     logger.info("🧠 Запуск задач генерации эмбеддингов")
     
     try:
-        result = app.send_task('common.tasks.embedding_tasks.generate_all_embeddings')
-        embeddings_result = result.get(timeout=1200)
+        result = _embeddings_group().apply_async()
         
-        logger.info("✅ Задачи генерации эмбеддингов завершены")
+        logger.info(f"✅ Задачи генерации эмбеддингов запущены: ID={result.id}")
         return {
-            'status': 'completed',
-            'result': embeddings_result,
+            'status': 'started',
+            'group_id': result.id,
             'timestamp': datetime.now().isoformat()
         }
         
@@ -184,13 +162,13 @@ def run_reranking_only(self) -> Dict[str, Any]:
     logger.info("🎯 Запуск задач реранжирования")
     
     try:
-        result = app.send_task('common.tasks.workflows.launch_reranking_tasks')
-        reranking_result = result.get(timeout=600)
+        # Зарегистрированная задача принимает результаты предыдущего этапа аргументом results
+        result = app.send_task('common.tasks.workflows.launch_reranking_tasks', args=[None])
         
-        logger.info("✅ Задачи реранжирования завершены")
+        logger.info(f"✅ Задача запуска реранжирования отправлена: ID={result.id}")
         return {
-            'status': 'completed',
-            'result': reranking_result,
+            'status': 'started',
+            'task_id': result.id,
             'timestamp': datetime.now().isoformat()
         }
         
@@ -210,7 +188,7 @@ def run_reranking_only(self) -> Dict[str, Any]:
     time_limit=900,
     max_retries=2
 )
-def launch_reranking_tasks(self) -> Dict[str, Any]:
+def launch_reranking_tasks(self, results=None) -> Dict[str, Any]:
     """Запуск группы задач реранжирования"""
     logger.info("🎯 Запуск группы задач реранжирования")
     
@@ -222,12 +200,11 @@ def launch_reranking_tasks(self) -> Dict[str, Any]:
         ])
         
         results = rerank_tasks.apply_async()
-        rerank_results = results.get(timeout=600)
         
-        logger.info("✅ Группа задач реранжирования завершена")
+        logger.info(f"✅ Группа задач реранжирования запущена: ID={results.id}")
         return {
-            'status': 'completed',
-            'results': rerank_results,
+            'status': 'started',
+            'group_id': results.id,
             'timestamp': datetime.now().isoformat()
         }
         
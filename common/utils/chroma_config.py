@@ -6,7 +6,7 @@ import os
 import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
-from typing import Optional
+from typing import Any, List, Optional
 
 class ChromaConfig:
     """Конфигурация ChromaDB"""
@@ -62,6 +62,17 @@ class ChromaDBClient:
             )
         return self._embedding_function
     
+    def create_embeddings(self, texts: List[str]) -> List[Any]:
+        """
+        Эмбеддинги списка текстов одним запросом к Ollama
+        
+        OllamaEmbeddingFunction отправляет весь список в /api/embed одним
+        вызовом, поэтому пакет документов не требует запроса на каждый текст.
+        """
+        if not texts:
+            return []
+        return list(self.embedding_function(list(texts)))
+    
     def get_or_create_collection(self, collection_name: str):
         """Получить или создать коллекцию"""
         try:
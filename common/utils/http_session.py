@@ -0,0 +1,30 @@
+"""
+HTTP-сессии для задач, обращающихся к внешним API и файловому хранилищу
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Соединение и TLS переиспользуются между запросами одного потока. Очереди обслуживают
+# пулы потоков, а requests.Session не рассчитана на общий доступ, поэтому сессия своя у каждого потока
+_http_local = threading.local()
+
+
+def get_http_session() -> requests.Session:
+    """Ленивая HTTP-сессия текущего потока с пулом соединений и повтором при 502/503/504"""
+    session = getattr(_http_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        ))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _http_local.session = session
+    return session
@@ -6,6 +6,7 @@
 
 import os
 import logging
+from operator import itemgetter
 from typing import Optional, List, Tuple
 from FlagEmbedding import FlagReranker
 
@@ -121,10 +122,10 @@ class RerankerClient:
         try:
             # Обрезаем тексты до максимальной длины (BGE-M3 поддерживает до 8192 токенов)
             truncated_query = query[:RerankerConfig.MAX_CHAR_LENGTH]
-            truncated_texts = [text[:RerankerConfig.MAX_CHAR_LENGTH] for text in texts]
             
-            # Формируем пары для reranking (кортежи вместо списков)
-            pairs = [(truncated_query, text) for text in truncated_texts]
+            # Формируем пары для reranking (кортежи вместо списков) за один проход,
+            # без промежуточного списка обрезанных текстов
+            pairs = [(truncated_query, text[:RerankerConfig.MAX_CHAR_LENGTH]) for text in texts]
             
             logger.info(f"🔍 Reranking {len(pairs)} текстов с помощью {self.model_name}")
             
@@ -156,15 +157,14 @@ class RerankerClient:
                     logger.error("❌ Не удалось преобразовать score в float")
                     return []
             
-            # Создаем список (индекс, score) и сортируем по убыванию score
-            indexed_scores = [(i, score) for i, score in enumerate(scores_list)]
-            indexed_scores.sort(key=lambda x: x[1], reverse=True)
-            
-            # Фильтруем по минимальному score
+            # Кортежи (индекс, score) создаются только для прошедших фильтр по
+            # минимальному score и сортируются на месте по убыванию score
+            min_score = RerankerConfig.MIN_RERANK_SCORE
             filtered_scores = [
-                (idx, score) for idx, score in indexed_scores 
-                if score >= RerankerConfig.MIN_RERANK_SCORE
+                (idx, score) for idx, score in enumerate(scores_list)
+                if score >= min_score
             ]
+            filtered_scores.sort(key=itemgetter(1), reverse=True)
             
             logger.info(f"📊 Reranking завершен: {len(filtered_scores)}/{len(texts)} текстов прошли фильтр")
             return filtered_scores
@@ -295,15 +295,14 @@ class RerankerClient:
                     logger.error("❌ Не удалось преобразовать score в float")
                     return []
             
-            # Создаем список (индекс, score) и сортируем по убыванию score
-            indexed_scores = [(i, score) for i, score in enumerate(scores_list)]
-            indexed_scores.sort(key=lambda x: x[1], reverse=True)
-            
-            # Фильтруем по минимальному score
+            # Кортежи (индекс, score) создаются только для прошедших фильтр по
+            # минимальному score и сортируются на месте по убыванию score
+            min_score = RerankerConfig.MIN_RERANK_SCORE
             filtered_scores = [
-                (idx, score) for idx, score in indexed_scores 
-                if score >= RerankerConfig.MIN_RERANK_SCORE
+                (idx, score) for idx, score in enumerate(scores_list)
+                if score >= min_score
             ]
+            filtered_scores.sort(key=itemgetter(1), reverse=True)
             
             logger.info(f"📊 Reranking завершен: {len(filtered_scores)}/{len(candidate_embeddings)} результатов прошли фильтр")
             return filtered_scores
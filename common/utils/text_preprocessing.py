@@ -4,12 +4,43 @@
 
 import re
 import unicodedata
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
 
+# Регулярные выражения предобработки компилируются один раз при импорте
+_SPECIAL_SPACES_RE = re.compile(r'[\u00A0\u1680\u180E\u2000-\u200B\u202F\u205F\u3000\uFEFF]')
+_DASHES_RE = re.compile(r'[–—―]')
+_QUOTES_RE = re.compile(r'[""„‚''‛]')
+_INLINE_WHITESPACE_RE = re.compile(r'[^\S\n]+')
+_LINE_BREAK_RE = re.compile(r'\r\n|\r')
+_SOFT_BREAK_RE = re.compile(r'(?<=[a-zа-я])\n(?=[a-zа-я])')
+_UNTERMINATED_BREAK_RE = re.compile(r'(?<=[^\.\!\?\:\;\n])\n(?=[^\n\-\*\d\s])')
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+|\n+')
+_WHITESPACE_RE = re.compile(r'\s+')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+_SPACE_BEFORE_PUNCT_RE = re.compile(r' +([,.!?;:])')
+_MISSING_SPACE_AFTER_PUNCT_RE = re.compile(r'([,.!?;:])([^\s\n])')
+
+# Начала строк, которые считаются элементами списка
+_LIST_PREFIXES = ('•', '-', '*', '1.', '2.', '3.', '4.', '5.')
+
+
 class TextPreprocessor:
     """Класс для предобработки текста перед созданием эмбеддингов"""
     
+    # Конфигурация по умолчанию: только для чтения, общая для всех экземпляров
+    DEFAULT_CONFIG = MappingProxyType({
+        'remove_extra_whitespace': True,
+        'normalize_line_breaks': True,
+        'remove_duplicates': True,
+        'min_sentence_length': 10,
+        'normalize_unicode': True,
+        'preserve_structure': True,
+        'remove_empty_lines': True,
+        'max_consecutive_newlines': 2
+    })
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Инициализация препроцессора
@@ -23,18 +54,7 @@ class TextPreprocessor:
                 - normalize_unicode: Нормализовать Unicode символы (по умолчанию True)
                 - preserve_structure: Сохранять структуру документа (по умолчанию True)
         """
-        default_config = {
-            'remove_extra_whitespace': True,
-            'normalize_line_breaks': True,
-            'remove_duplicates': True,
-            'min_sentence_length': 10,
-            'normalize_unicode': True,
-            'preserve_structure': True,
-            'remove_empty_lines': True,
-            'max_consecutive_newlines': 2
-        }
-        
-        self.config = {**default_config, **(config or {})}
+        self.config = {**self.DEFAULT_CONFIG, **(config or {})}
     
     def preprocess(self, text: str) -> str:
         """
@@ -83,20 +103,20 @@ class TextPreprocessor:
         text = unicodedata.normalize('NFC', text)
         
         # Замена специальных пробельных символов на обычные пробелы
-        text = re.sub(r'[\u00A0\u1680\u180E\u2000-\u200B\u202F\u205F\u3000\uFEFF]', ' ', text)
+        text = _SPECIAL_SPACES_RE.sub(' ', text)
         
         # Замена различных видов тире на стандартный дефис
-        text = re.sub(r'[–—―]', '-', text)
+        text = _DASHES_RE.sub('-', text)
         
         # Замена различных видов кавычек на стандартные
-        text = re.sub(r'[""„‚''‛]', '"', text)
+        text = _QUOTES_RE.sub('"', text)
         
         return text
     
     def _remove_extra_whitespace(self, text: str) -> str:
         """Удаление лишних пробелов и табуляций"""
         # Замена всех пробельных символов (кроме переносов строк) на обычные пробелы
-        text = re.sub(r'[^\S\n]+', ' ', text)
+        text = _INLINE_WHITESPACE_RE.sub(' ', text)
         
         # Удаление пробелов в начале и конце строк
         lines = text.split('\n')
@@ -108,17 +128,17 @@ class TextPreprocessor:
     def _normalize_line_breaks(self, text: str) -> str:
         """Нормализация переносов строк"""
         # Замена всех видов переносов строк на стандартный \n
-        text = re.sub(r'\r\n|\r', '\n', text)
+        text = _LINE_BREAK_RE.sub('\n', text)
         
         # Удаление переносов строк в середине предложений (где нет знаков препинания)
         if self.config['preserve_structure']:
             # Более консервативный подход - объединяем строки только если:
             # - предыдущая строка не заканчивается знаком препинания
             # - следующая строка не начинается с заглавной буквы или специальных символов
-            text = re.sub(r'(?<=[a-zа-я])\n(?=[a-zа-я])', ' ', text)
+            text = _SOFT_BREAK_RE.sub(' ', text)
         else:
             # Агрессивный подход - объединяем все строки без явных разделителей
-            text = re.sub(r'(?<=[^\.\!\?\:\;\n])\n(?=[^\n\-\*\d\s])', ' ', text)
+            text = _UNTERMINATED_BREAK_RE.sub(' ', text)
         
         return text
     
@@ -138,7 +158,7 @@ class TextPreprocessor:
     def _remove_duplicate_sentences(self, text: str) -> str:
         """Удаление дублирующихся предложений"""
         # Разбиваем текст на предложения по разным разделителям
-        sentences = re.split(r'[.!?]+|\n+', text)
+        sentences = _SENTENCE_SPLIT_RE.split(text)
         
         # Очищаем предложения и удаляем дубликаты
         seen_sentences = set()
@@ -146,7 +166,7 @@ class TextPreprocessor:
         
         for sentence in sentences:
             # Очищаем предложение
-            clean_sentence = re.sub(r'\s+', ' ', sentence.strip()).lower()
+            clean_sentence = _WHITESPACE_RE.sub(' ', sentence.strip()).lower()
             
             # Пропускаем слишком короткие предложения
             if len(clean_sentence) < self.config['min_sentence_length']:
@@ -167,7 +187,7 @@ class TextPreprocessor:
             for sentence in unique_sentences:
                 if sentence.endswith(('.', '!', '?')):
                     result.append(sentence)
-                elif any(sentence.startswith(prefix) for prefix in ['•', '-', '*', '1.', '2.', '3.', '4.', '5.']):
+                elif sentence.startswith(_LIST_PREFIXES):
                     # Для списков добавляем перенос строки
                     result.append(sentence)
                 else:
@@ -194,13 +214,13 @@ class TextPreprocessor:
     def _final_cleanup(self, text: str) -> str:
         """Финальная очистка текста"""
         # Удаление множественных пробелов
-        text = re.sub(r' {2,}', ' ', text)
+        text = _MULTI_SPACE_RE.sub(' ', text)
         
         # Удаление пробелов перед знаками препинания
-        text = re.sub(r' +([,.!?;:])', r'\1', text)
+        text = _SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
         
         # Добавление пробела после знаков препинания если его нет
-        text = re.sub(r'([,.!?;:])([^\s\n])', r'\1 \2', text)
+        text = _MISSING_SPACE_AFTER_PUNCT_RE.sub(r'\1 \2', text)
         
         # Удаление пробелов в начале и конце
         text = text.strip()
@@ -7,6 +7,7 @@ echo "Режим: Development (все очереди)"
 echo "================================="
 
 cd "$(dirname "$0")"
+export PYTHONPATH="${PYTHONPATH}:$(pwd)"
 
 # Останавливаем все старые процессы Celery
 echo "🛑 Останавливаем старые процессы..."
@@ -23,5 +24,6 @@ echo "🔄 Запускаем worker..."
 exec celery -A common.celery_app.celery_app:celery_app worker \
     --loglevel=info \
     --concurrency=2 \
+    -O fair \
     --queues=celery,fillout_processing,text_processing,embeddings,reranking,orchestration \
     --hostname=worker_all@%h
@@ -37,6 +37,16 @@ try:
 except Exception as e:
     print(f"Ошибка импорта эмбеддингов: {e}")
 
+# Проверим, что мапперы всех моделей (relationships, атрибуты классов) собираются
+print("Настраиваем мапперы...")
+from sqlalchemy.orm import configure_mappers
+try:
+    configure_mappers()
+    print("Мапперы настроены")
+except Exception as e:
+    print(f"Ошибка настройки мапперов: {e}")
+    raise SystemExit(1)
+
 print("Все модели импортированы успешно!")
 
 # Проверим, что все модели зарегистрированы